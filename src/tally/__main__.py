@@ -1,5 +1,9 @@
 """Entry point for running tally as a module or frozen executable."""
+import multiprocessing
+
 from tally.cli import main
 
 if __name__ == '__main__':
+    # Frozen executables must handle multiprocessing worker startup themselves
+    multiprocessing.freeze_support()
     main()
@@ -6,11 +6,14 @@ Analyzes AMEX and BOA transactions using merchant categorization rules.
 
 import csv
 import json
+import math
 import os
 import re
 import sys
 from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime
+from operator import itemgetter, mul
 from pathlib import Path
 
 
@@ -27,7 +30,18 @@ def get_template_dir():
         # Running as normal Python
         return Path(__file__).parent
 
-from .merchant_utils import normalize_merchant
+
+@lru_cache(maxsize=8)
+def _read_cached(path, mtime_ns):
+    return Path(path).read_text(encoding='utf-8')
+
+
+def read_template(path):
+    """Read a template/asset file, cached until the file's mtime changes."""
+    return _read_cached(str(path), os.stat(path).st_mtime_ns)
+
+from .merchant_utils import normalize_merchants
+from .classification_rules import classify_merchant, get_default_rules_parsed, rules_for_fields
 from .format_parser import FormatSpec
 from . import section_engine
 
@@ -38,6 +52,18 @@ try:
 except ImportError:
     EMBEDDINGS_AVAILABLE = False
 
+# Use orjson for the report payload if available; it is much faster on large data
+try:
+    import orjson
+
+    def dumps_compact(obj):
+        """Encode obj as compact JSON text."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+except ImportError:
+    def dumps_compact(obj):
+        """Encode obj as compact JSON text."""
+        return json.dumps(obj, separators=(',', ':'))
+
 
 # ============================================================================
 # CURRENCY FORMATTING
@@ -75,6 +101,22 @@ def format_currency_decimal(amount: float, currency_format: str = "${amount}") -
 # DATA PARSING
 # ============================================================================
 
+# Trailing 2-letter state/country code in a description
+LOCATION_PATTERN = re.compile(r'\s+([A-Z]{2})\s*$')
+# Single-pass amount cleanup: drop currency symbols and thousand separators
+# (European format also turns the decimal comma into a period for float())
+US_AMOUNT_TABLE = str.maketrans('', '', '$€£¥,')
+EU_AMOUNT_TABLE = str.maketrans({'$': None, '€': None, '£': None, '¥': None,
+                                 '.': None, ' ': None, ',': '.'})
+# Shared, immutable tags value for the many transactions whose rule has no tags
+EMPTY_TAGS = ()
+# Statement files are read in large chunks; newline='' leaves line endings to csv
+READ_BUFFER_SIZE = 1 << 20
+# BOA statement line: MM/DD/YYYY  Description  Amount  Balance
+# (surrounding whitespace and the newline are matched, so lines needn't be stripped)
+BOA_LINE_PATTERN = re.compile(r'^\s*(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([-\d,]+\.\d{2})\s+([-\d,]+\.\d{2})\s*$')
+
+
 def parse_amount(amount_str, decimal_separator='.'):
     """Parse an amount string to float, handling various formats.
 
@@ -93,33 +135,67 @@ def parse_amount(amount_str, decimal_separator='.'):
         negative = True
         amount_str = amount_str[1:-1]
 
-    # Remove currency symbols
-    amount_str = re.sub(r'[$€£¥]', '', amount_str).strip()
+    # European format: 1.234,56 or 1 234,56; US format: 1,234.56
+    # (float() ignores any whitespace left around the number)
+    table = EU_AMOUNT_TABLE if decimal_separator == ',' else US_AMOUNT_TABLE
+    result = float(amount_str.translate(table))
+    return -result if negative else result
 
-    if decimal_separator == ',':
-        # European format: 1.234,56 or 1 234,56
-        # Remove thousand separators (period or space)
-        amount_str = amount_str.replace('.', '').replace(' ', '')
-        # Convert decimal comma to period for float()
-        amount_str = amount_str.replace(',', '.')
-    else:
-        # US format: 1,234.56
-        # Remove thousand separators (comma)
-        amount_str = amount_str.replace(',', '')
 
-    result = float(amount_str)
-    return -result if negative else result
+def _parse_mdy(date_str):
+    """Parse an MM/DD/YYYY date by slicing, falling back to strptime for other shapes."""
+    s = date_str
+    if len(s) == 10 and s[2] == '/' and s[5] == '/' and \
+            s[:2].isdigit() and s[3:5].isdigit() and s[6:].isdigit():
+        return datetime(int(s[6:]), int(s[:2]), int(s[3:5]))
+    return datetime.strptime(date_str, '%m/%d/%Y')
+
+
+def _parse_ymd(date_str):
+    """Parse a YYYY-MM-DD date by slicing, falling back to strptime for other shapes."""
+    s = date_str
+    if len(s) == 10 and s[4] == '-' and s[7] == '-' and \
+            s[:4].isdigit() and s[5:7].isdigit() and s[8:].isdigit():
+        return datetime(int(s[:4]), int(s[5:7]), int(s[8:]))
+    return datetime.strptime(date_str, '%Y-%m-%d')
+
+
+# Hand-written parsers for the common fixed-width date formats (strptime is much slower)
+DATE_PARSERS = {
+    '%m/%d/%Y': _parse_mdy,
+    '%Y-%m-%d': _parse_ymd,
+}
+
+
+def _date_parser(date_format):
+    """Return a function parsing date strings in date_format."""
+    parser = DATE_PARSERS.get(date_format)
+    if parser is None:
+        def parser(date_str):
+            return datetime.strptime(date_str, date_format)
+    return parser
 
 
 def extract_location(description):
     """Extract state/country code from transaction description."""
     # Pattern: ends with 2-letter code (state or country)
-    match = re.search(r'\s+([A-Z]{2})\s*$', description)
+    match = LOCATION_PATTERN.search(description)
     if match:
-        return match.group(1)
+        return sys.intern(match.group(1))
     return None
 
 
+# US state codes
+US_STATES = frozenset({
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+    'DC', 'PR', 'VI', 'GU'
+})
+
+
 def is_travel_location(location, home_locations):
     """Determine if a location represents travel (away from home).
 
@@ -137,66 +213,101 @@ def is_travel_location(location, home_locations):
     if not location:
         return False
 
-    # US state codes
-    us_states = {
-        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-        'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-        'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-        'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-        'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
-        'DC', 'PR', 'VI', 'GU'
-    }
-
-    location = location.upper()
-
     # International (not a US state) = travel unless explicitly in home_locations
-    if location not in us_states:
-        return location not in home_locations
+    # (codes are usually already uppercase, so only uppercase when needed)
+    if location not in US_STATES:
+        location = location.upper()
+        if location not in US_STATES:
+            return location not in home_locations
 
     # Domestic US states = NOT travel by default
     # Users can mark specific locations as travel via merchant_categories.csv
     return False
 
 
+def _intern(value):
+    """Intern a frequently repeated string field; None and '' pass through."""
+    return sys.intern(value) if value else value
+
+
+def _normalize_columns(dates, descriptions, amounts, rules, cleaning_patterns):
+    """Normalize merchants for a file's parsed columns in one batch.
+
+    Merchant, category and subcategory strings are interned so the many rows
+    sharing a value share one string object.
+    """
+    normalized = normalize_merchants(
+        descriptions, rules,
+        amounts=amounts,
+        dates=[date.date() for date in dates],
+        cleaning_patterns=cleaning_patterns
+    )
+    return [
+        (_intern(merchant), _intern(category), _intern(subcategory), match_info)
+        for merchant, category, subcategory, match_info in normalized
+    ]
+
+
 def parse_amex(filepath, rules, home_locations=None, cleaning_patterns=None):
     """Parse AMEX CSV file and return list of transactions.
 
     DEPRECATED: Use format strings instead. This parser will be removed in a future release.
     """
-    home_locations = home_locations or set()
+    home_locations = frozenset(home_locations or ())
     transactions = []
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    # Parsed fields, one list per column
+    dates, descriptions, amounts = [], [], []
+    date_cache = {}  # Statements repeat few distinct dates; parse each once
+    with open(filepath, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        # Look columns up by header position so rows stay plain lists, not per-row dicts
+        columns = {name: i for i, name in enumerate(next(reader, None) or [])}
+        if not {'Amount', 'Date', 'Description'} <= columns.keys():
+            return transactions
+        amount_col, date_col, description_col = columns['Amount'], columns['Date'], columns['Description']
+
         for row in reader:
             try:
-                amount = float(row['Amount'])
+                amount = float(row[amount_col])
                 if amount == 0:
                     continue
 
-                date = datetime.strptime(row['Date'], '%m/%d/%Y')
-                merchant, category, subcategory, match_info = normalize_merchant(
-                    row['Description'], rules, amount=amount, txn_date=date.date(),
-                    cleaning_patterns=cleaning_patterns
-                )
-                location = extract_location(row['Description'])
-
-                transactions.append({
-                    'date': date,
-                    'raw_description': row['Description'],
-                    'description': row['Description'],
-                    'amount': amount,
-                    'merchant': merchant,
-                    'category': category,
-                    'subcategory': subcategory,
-                    'source': 'AMEX',
-                    'location': location,
-                    'is_travel': is_travel_location(location, home_locations),
-                    'match_info': match_info,
-                    'tags': match_info.get('tags', []) if match_info else [],
-                })
-            except (ValueError, KeyError):
+                date_str = row[date_col]
+                date = date_cache.get(date_str)
+                if date is None:
+                    date = date_cache[date_str] = _parse_mdy(date_str)
+                description = row[description_col]
+            except (ValueError, IndexError):
                 continue
+            dates.append(date)
+            descriptions.append(description)
+            amounts.append(amount)
+
+    normalized = _normalize_columns(dates, descriptions, amounts, rules, cleaning_patterns)
+    travel_cache = {}  # is_travel_location result per distinct location
+    for date, description, amount, (merchant, category, subcategory, match_info) in zip(
+            dates, descriptions, amounts, normalized):
+        location = extract_location(description)
+
+        is_travel = travel_cache.get(location)
+        if is_travel is None:
+            is_travel = travel_cache[location] = is_travel_location(location, home_locations)
+
+        transactions.append({
+            'date': date,
+            'raw_description': description,
+            'description': description,
+            'amount': amount,
+            'merchant': merchant,
+            'category': category,
+            'subcategory': subcategory,
+            'source': 'AMEX',
+            'location': location,
+            'is_travel': is_travel,
+            'match_info': match_info,
+            'tags': match_info.get('tags', EMPTY_TAGS) if match_info else EMPTY_TAGS,
+        })
 
     return transactions
 
@@ -206,49 +317,59 @@ def parse_boa(filepath, rules, home_locations=None, cleaning_patterns=None):
 
     DEPRECATED: Use format strings instead. This parser will be removed in a future release.
     """
-    home_locations = home_locations or set()
+    home_locations = frozenset(home_locations or ())
     transactions = []
 
-    with open(filepath, 'r', encoding='utf-8') as f:
+    # Parsed fields, one list per column
+    dates, descriptions, amounts = [], [], []
+    date_cache = {}  # Statements repeat few distinct dates; parse each once
+    with open(filepath, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as f:
         for line in f:
-            # Format: MM/DD/YYYY  Description  Amount  Balance
-            match = re.match(
-                r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([-\d,]+\.\d{2})\s+([-\d,]+\.\d{2})$',
-                line.strip()
-            )
+            match = BOA_LINE_PATTERN.match(line)
             if not match:
                 continue
 
             try:
-                date = datetime.strptime(match.group(1), '%m/%d/%Y')
+                date_str = match.group(1)
+                date = date_cache.get(date_str)
+                if date is None:
+                    date = date_cache[date_str] = _parse_mdy(date_str)
                 description = match.group(2)
                 amount = float(match.group(3).replace(',', ''))
 
                 if amount == 0:
                     continue
 
-                merchant, category, subcategory, match_info = normalize_merchant(
-                    description, rules, amount=amount, txn_date=date.date(),
-                    cleaning_patterns=cleaning_patterns
-                )
-                location = extract_location(description)
-
-                transactions.append({
-                    'date': date,
-                    'raw_description': description,
-                    'description': description,
-                    'amount': amount,
-                    'merchant': merchant,
-                    'match_info': match_info,
-                    'category': category,
-                    'subcategory': subcategory,
-                    'source': 'BOA',
-                    'location': location,
-                    'is_travel': is_travel_location(location, home_locations),
-                    'tags': match_info.get('tags', []) if match_info else [],
-                })
             except ValueError:
                 continue
+            dates.append(date)
+            descriptions.append(description)
+            amounts.append(amount)
+
+    normalized = _normalize_columns(dates, descriptions, amounts, rules, cleaning_patterns)
+    travel_cache = {}  # is_travel_location result per distinct location
+    for date, description, amount, (merchant, category, subcategory, match_info) in zip(
+            dates, descriptions, amounts, normalized):
+        location = extract_location(description)
+
+        is_travel = travel_cache.get(location)
+        if is_travel is None:
+            is_travel = travel_cache[location] = is_travel_location(location, home_locations)
+
+        transactions.append({
+            'date': date,
+            'raw_description': description,
+            'description': description,
+            'amount': amount,
+            'merchant': merchant,
+            'match_info': match_info,
+            'category': category,
+            'subcategory': subcategory,
+            'source': 'BOA',
+            'location': location,
+            'is_travel': is_travel,
+            'tags': match_info.get('tags', EMPTY_TAGS) if match_info else EMPTY_TAGS,
+        })
 
     return transactions
 
@@ -264,7 +385,7 @@ def _iter_rows_with_delimiter(filepath, delimiter, has_header):
     Yields:
         List of column values for each row
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with open(filepath, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as f:
         if delimiter and delimiter.startswith('regex:'):
             # Regex-based parsing
             pattern = re.compile(delimiter[6:])  # Strip 'regex:' prefix
@@ -293,6 +414,30 @@ def _iter_rows_with_delimiter(filepath, delimiter, has_header):
                 yield row
 
 
+def _description_reader(format_spec):
+    """Return a function building a row's description for this format.
+
+    The description mode is chosen once per file instead of re-checked per row.
+    """
+    if format_spec.description_column is not None:
+        # Mode 1: Simple {description}
+        description_col = format_spec.description_column
+
+        def read_description(row):
+            return row[description_col].strip()
+    else:
+        # Mode 2: Custom captures + template
+        captures = list(format_spec.custom_captures.items())
+        template = format_spec.description_template
+
+        def read_description(row):
+            return template.format(**{
+                name: row[col_idx].strip() if col_idx < len(row) else ''
+                for name, col_idx in captures
+            })
+    return read_description
+
+
 def parse_generic_csv(filepath, format_spec, rules, home_locations=None, source_name='CSV',
                       decimal_separator='.', cleaning_patterns=None):
     """
@@ -315,58 +460,63 @@ def parse_generic_csv(filepath, format_spec, rules, home_locations=None, source_
     Returns:
         List of transaction dictionaries
     """
-    home_locations = home_locations or set()
+    home_locations = frozenset(home_locations or ())
     transactions = []
 
     # Get delimiter from format spec
     delimiter = getattr(format_spec, 'delimiter', None)
 
+    # Per-file settings, resolved once rather than per row
+    required_cols = [format_spec.date_column, format_spec.amount_column]
+    if format_spec.description_column is not None:
+        required_cols.append(format_spec.description_column)
+    if format_spec.custom_captures:
+        required_cols.extend(format_spec.custom_captures.values())
+    if format_spec.location_column is not None:
+        required_cols.append(format_spec.location_column)
+    max_col = max(required_cols)
+
+    # Only strip trailing text after the date if the date format doesn't contain
+    # spaces (formats like "%d %b %y" for "30 Dec 25" need the spaces preserved)
+    strip_date_suffix = ' ' not in format_spec.date_format
+    source = format_spec.source_name or source_name
+    skip_negative = getattr(format_spec, 'skip_negative', False)
+    parse_date = _date_parser(format_spec.date_format)
+    read_description = _description_reader(format_spec)
+    date_col, amount_col = format_spec.date_column, format_spec.amount_column
+    location_col = format_spec.location_column
+    negate_amount = format_spec.negate_amount
+
+    # Parsed fields, one list per column
+    dates, descriptions, amounts, credits, exclusions, locations = [], [], [], [], [], []
+    date_cache = {}  # Statements repeat few distinct dates; parse each once
     for row in _iter_rows_with_delimiter(filepath, delimiter, format_spec.has_header):
         try:
             # Ensure row has enough columns
-            required_cols = [format_spec.date_column, format_spec.amount_column]
-            if format_spec.description_column is not None:
-                required_cols.append(format_spec.description_column)
-            if format_spec.custom_captures:
-                required_cols.extend(format_spec.custom_captures.values())
-            if format_spec.location_column is not None:
-                required_cols.append(format_spec.location_column)
-            max_col = max(required_cols)
-
             if len(row) <= max_col:
                 continue  # Skip malformed rows
 
             # Extract values
-            date_str = row[format_spec.date_column].strip()
-            amount_str = row[format_spec.amount_column].strip()
-
-            # Build description from either mode
-            if format_spec.description_column is not None:
-                # Mode 1: Simple {description}
-                description = row[format_spec.description_column].strip()
-            else:
-                # Mode 2: Custom captures + template
-                captures = {}
-                for name, col_idx in format_spec.custom_captures.items():
-                    captures[name] = row[col_idx].strip() if col_idx < len(row) else ''
-                description = format_spec.description_template.format(**captures)
+            date_str = row[date_col].strip()
+            amount_str = row[amount_col].strip()
+            description = read_description(row)
 
             # Skip empty rows
             if not date_str or not description or not amount_str:
                 continue
 
             # Parse date - handle optional day suffix (e.g., "01/02/2017  Mon")
-            # Only strip trailing text if the date format doesn't contain spaces
-            # (formats like "%d %b %y" for "30 Dec 25" need the spaces preserved)
-            if ' ' not in format_spec.date_format:
+            if strip_date_suffix:
                 date_str = date_str.split()[0]  # Take just the date part
-            date = datetime.strptime(date_str, format_spec.date_format)
+            date = date_cache.get(date_str)
+            if date is None:
+                date = date_cache[date_str] = parse_date(date_str)
 
             # Parse amount (handle locale-specific formats)
             amount = parse_amount(amount_str, decimal_separator)
 
             # Apply negation if specified (for credit cards where positive = charge)
-            if format_spec.negate_amount:
+            if negate_amount:
                 amount = -amount
 
             # Skip zero amounts
@@ -379,43 +529,55 @@ def parse_generic_csv(filepath, format_spec, rules, home_locations=None, source_
             # Mark credits as excluded if configured (for bank accounts where credits are income)
             # Instead of skipping, we include them but mark as excluded for transparency
             excluded_reason = None
-            if is_credit and getattr(format_spec, 'skip_negative', False):
+            if is_credit and skip_negative:
                 excluded_reason = 'income'  # Credit/deposit excluded from spending analysis
 
             # Extract location
             location = None
-            if format_spec.location_column is not None:
-                location = row[format_spec.location_column].strip()
+            if location_col is not None:
+                location = _intern(row[location_col].strip())
             if not location:
                 location = extract_location(description)
 
-            # Normalize merchant
-            merchant, category, subcategory, match_info = normalize_merchant(
-                description, rules, amount=amount, txn_date=date.date(),
-                cleaning_patterns=cleaning_patterns
-            )
-
-            transactions.append({
-                'date': date,
-                'raw_description': description,
-                'description': merchant,
-                'amount': amount,
-                'merchant': merchant,
-                'category': category,
-                'subcategory': subcategory,
-                'source': format_spec.source_name or source_name,
-                'location': location,
-                'is_travel': is_travel_location(location, home_locations),
-                'is_credit': is_credit,
-                'match_info': match_info,
-                'tags': match_info.get('tags', []) if match_info else [],
-                'excluded': excluded_reason,  # None if included, or reason string if excluded
-            })
-
         except (ValueError, IndexError):
             # Skip problematic rows
             continue
 
+        dates.append(date)
+        descriptions.append(description)
+        amounts.append(amount)
+        credits.append(is_credit)
+        exclusions.append(excluded_reason)
+        locations.append(location)
+
+    # Normalize merchants for the whole file at once
+    normalized = _normalize_columns(dates, descriptions, amounts, rules, cleaning_patterns)
+    travel_cache = {}  # is_travel_location result per distinct location
+    for date, description, amount, is_credit, excluded_reason, location, merchant_fields in zip(
+            dates, descriptions, amounts, credits, exclusions, locations, normalized):
+        merchant, category, subcategory, match_info = merchant_fields
+
+        is_travel = travel_cache.get(location)
+        if is_travel is None:
+            is_travel = travel_cache[location] = is_travel_location(location, home_locations)
+
+        transactions.append({
+            'date': date,
+            'raw_description': description,
+            'description': merchant,
+            'amount': amount,
+            'merchant': merchant,
+            'category': category,
+            'subcategory': subcategory,
+            'source': source,
+            'location': location,
+            'is_travel': is_travel,
+            'is_credit': is_credit,
+            'match_info': match_info,
+            'tags': match_info.get('tags', EMPTY_TAGS) if match_info else EMPTY_TAGS,
+            'excluded': excluded_reason,  # None if included, or reason string if excluded
+        })
+
     return transactions
 
 
@@ -517,25 +679,15 @@ def classify_by_occurrence(merchant, data, num_months=12, rules=None):
         - calc_type: 'avg' or '/12'
         - reasoning: dict with classification details
     """
-    from .classification_rules import classify_merchant, get_default_rules_parsed
-
     # Use default rules if none provided
     if rules is None:
         rules = get_default_rules_parsed()
 
-    # Build stats dict for rule engine
-    stats = {
-        'category': data.get('category', ''),
-        'subcategory': data.get('subcategory', ''),
-        'months_active': data.get('months_active', 1),
-        'count': data.get('count', 0),
-        'total': data.get('total', 0),
-        'cv': data.get('cv', 0),
-        'max_payment': data.get('max_payment', 0),
-    }
-
-    # Classify using rule engine
-    bucket, calc_type = classify_merchant(stats, rules, num_months)
+    # Classify using rule engine. The merchant data already uses the rule
+    # engine's stat names, and the engine applies the same defaults for
+    # missing keys, so it is passed as-is rather than copied into a stats dict.
+    bucket, calc_type = classify_merchant(data, rules, num_months)
+    cv = data.get('cv', 0)
 
     # Build reasoning structure for backward compatibility
     reasoning = {
@@ -545,22 +697,34 @@ def classify_by_occurrence(merchant, data, num_months=12, rules=None):
             'general_threshold': max(3, int(num_months * 0.75)),
         },
         'decision': f"{bucket.title()}: classified by rule engine",
-        'category': stats['category'],
-        'subcategory': stats['subcategory'],
-        'months_active': stats['months_active'],
+        'category': data.get('category', ''),
+        'subcategory': data.get('subcategory', ''),
+        'months_active': data.get('months_active', 1),
         'num_months': num_months,
-        'cv': round(stats['cv'], 2),
-        'is_consistent': data.get('is_consistent', stats['cv'] < 0.3),
+        'cv': round(cv, 2),
+        'is_consistent': data.get('is_consistent', cv < 0.3),
         'calc_type': calc_type,
     }
 
     return (bucket, calc_type, reasoning)
 
 
-def analyze_transactions(transactions):
-    """Analyze transactions and return summary statistics."""
-    by_category = defaultdict(lambda: {'count': 0, 'total': 0})
-    by_merchant = defaultdict(lambda: {
+def _coefficient_of_variation(values):
+    """Population std_dev / mean of values (0 = perfectly consistent, >0.5 = lumpy).
+
+    values may be any sized collection that can be iterated twice, e.g. a dict view.
+    """
+    avg = sum(values) / len(values)
+    # map(mul) squares in C rather than evaluating a generator frame per value
+    deviations = [x - avg for x in values]
+    variance = sum(map(mul, deviations, deviations)) / len(values)
+    std_dev = variance ** 0.5
+    return std_dev / avg if avg > 0 else 0
+
+
+def _new_merchant_entry():
+    """Return an empty per-merchant aggregate for analyze_transactions."""
+    return {
         'count': 0,
         'total': 0,
         'category': '',
@@ -568,17 +732,33 @@ def analyze_transactions(transactions):
         'months': set(),  # Track which months this merchant appears
         'monthly_amounts': defaultdict(float),  # Amount per month
         'max_payment': 0,  # Largest single payment
-        'payments': [],  # All individual payment amounts
         'transactions': [],  # Individual transactions for drill-down
         'tags': set(),  # Collect all tags from matching rules
         'raw_descriptions': defaultdict(int),  # Track raw description variations
-    })
+    }
+
+
+def analyze_transactions(transactions):
+    """Analyze transactions and return summary statistics."""
+    by_category = {}
+    by_merchant = {}
     by_month = defaultdict(float)
 
     # Track excluded transactions separately (for transparency in UI)
     excluded_transactions = []
 
+    # Transactions share few distinct dates; format each one once
+    date_labels = {}
+
     for txn in transactions:
+        txn_date = txn['date']
+        labels = date_labels.get(txn_date)
+        if labels is None:
+            # Same as strftime('%m/%d') and strftime('%Y-%m'), without the format parsing
+            labels = date_labels[txn_date] = (f"{txn_date.month:02d}/{txn_date.day:02d}",
+                                              f"{txn_date.year:04d}-{txn_date.month:02d}")
+        day_label, month_key = labels
+
         # Track excluded transactions separately but don't include in spending analysis
         # Exclude: income/credits from bank accounts, and Transfers category (to avoid double-counting)
         excluded_reason = txn.get('excluded')
@@ -587,8 +767,8 @@ def analyze_transactions(transactions):
 
         if excluded_reason:
             excluded_transactions.append({
-                'date': txn['date'].strftime('%m/%d'),
-                'month': txn['date'].strftime('%Y-%m'),
+                'date': day_label,
+                'month': month_key,
                 'raw_description': txn.get('raw_description', txn['description']),
                 'description': txn['description'],
                 'merchant': txn['merchant'],
@@ -601,45 +781,49 @@ def analyze_transactions(transactions):
                 'excluded_reason': excluded_reason,
             })
             continue  # Don't include in spending totals
-        key = (txn['category'], txn['subcategory'])
-        by_category[key]['count'] += 1
-        by_category[key]['total'] += txn['amount']
-
-        month_key = txn['date'].strftime('%Y-%m')
+        amount = txn['amount']
+        category_key = (txn['category'], txn['subcategory'])
+        category_data = by_category.get(category_key)
+        if category_data is None:
+            category_data = by_category[category_key] = {'count': 0, 'total': 0}
+        category_data['count'] += 1
+        category_data['total'] += amount
 
         # Always track by merchant - is_travel flag determines classification
-        by_merchant[txn['merchant']]['count'] += 1
-        by_merchant[txn['merchant']]['total'] += txn['amount']
-        by_merchant[txn['merchant']]['category'] = txn['category']
-        by_merchant[txn['merchant']]['subcategory'] = txn['subcategory']
-        by_merchant[txn['merchant']]['months'].add(month_key)
-        by_merchant[txn['merchant']]['monthly_amounts'][month_key] += txn['amount']
-        by_merchant[txn['merchant']]['payments'].append(txn['amount'])
-        by_merchant[txn['merchant']]['transactions'].append({
-            'date': txn['date'].strftime('%m/%d'),
+        merchant_data = by_merchant.get(txn['merchant'])
+        if merchant_data is None:
+            merchant_data = by_merchant[txn['merchant']] = _new_merchant_entry()
+        merchant_data['count'] += 1
+        merchant_data['total'] += amount
+        merchant_data['category'] = txn['category']
+        merchant_data['subcategory'] = txn['subcategory']
+        merchant_data['months'].add(month_key)
+        merchant_data['monthly_amounts'][month_key] += amount
+        merchant_data['transactions'].append({
+            'date': day_label,
             'month': month_key,
             'description': txn['description'],
-            'amount': txn['amount'],
+            'amount': amount,
             'source': txn['source'],
             'location': txn.get('location'),
             'tags': txn.get('tags', [])
         })
         # Track max payment
-        if txn['amount'] > by_merchant[txn['merchant']]['max_payment']:
-            by_merchant[txn['merchant']]['max_payment'] = txn['amount']
+        if amount > merchant_data['max_payment']:
+            merchant_data['max_payment'] = amount
         # Mark merchant as travel if ANY transaction is travel (location-based)
         if txn.get('is_travel'):
-            by_merchant[txn['merchant']]['is_travel'] = True
+            merchant_data['is_travel'] = True
         # Store match info (pattern that matched) - first transaction sets this
-        if 'match_info' not in by_merchant[txn['merchant']] and txn.get('match_info'):
-            by_merchant[txn['merchant']]['match_info'] = txn['match_info']
+        if 'match_info' not in merchant_data and txn.get('match_info'):
+            merchant_data['match_info'] = txn['match_info']
         # Collect tags from all transactions
-        by_merchant[txn['merchant']]['tags'].update(txn.get('tags', []))
+        merchant_data['tags'].update(txn.get('tags', []))
         # Track raw description variations
         raw_desc = txn.get('raw_description', txn.get('description', ''))
-        by_merchant[txn['merchant']]['raw_descriptions'][raw_desc] += 1
+        merchant_data['raw_descriptions'][raw_desc] += 1
 
-        by_month[month_key] += txn['amount']
+        by_month[month_key] += amount
 
     # Calculate months active and monthly average for each merchant
     all_months = set(by_month.keys())
@@ -650,13 +834,9 @@ def analyze_transactions(transactions):
         data['avg_when_active'] = data['total'] / data['months_active'] if data['months_active'] > 0 else 0
 
         # Calculate consistency: are monthly amounts similar or lumpy?
-        monthly_vals = list(data['monthly_amounts'].values())
-        if len(monthly_vals) >= 2:
-            avg = sum(monthly_vals) / len(monthly_vals)
-            variance = sum((x - avg) ** 2 for x in monthly_vals) / len(monthly_vals)
-            std_dev = variance ** 0.5
-            # Coefficient of variation: std_dev / mean (0 = perfectly consistent, >0.5 = lumpy)
-            data['cv'] = std_dev / avg if avg > 0 else 0
+        # (most merchants appear in a single month and skip this)
+        if len(data['monthly_amounts']) >= 2:
+            data['cv'] = _coefficient_of_variation(data['monthly_amounts'].values())
             data['is_consistent'] = data['cv'] < 0.3  # Less than 30% variation = consistent
         else:
             data['cv'] = 0
@@ -667,31 +847,57 @@ def analyze_transactions(transactions):
     # =========================================================================
     # CLASSIFY BY OCCURRENCE PATTERN
     # =========================================================================
+    # Parse the classification rules once for all merchants, and narrow them
+    # once per distinct category/subcategory pair
+    classification_rules = get_default_rules_parsed()
+    rules_by_fields = {}
+
+    def compute_monthly_value(data):
+        """Compute monthly value based on calc_type from rule engine."""
+        calc_type = data.get('calc_type', '/12')
+        if calc_type == 'avg':
+            monthly_value = data.get('avg_when_active', data['total'] / max(data['months_active'], 1))
+            data['calc_reasoning'] = f"CV={data['cv']:.2f} (<0.3), using average when active"
+            data['calc_formula'] = f"avg_when_active = {data['total']:.2f} / {data['months_active']} months = {monthly_value:.2f}"
+        else:
+            monthly_value = data['total'] / 12
+            data['calc_reasoning'] = f"Spread over 12 months"
+            data['calc_formula'] = f"total / 12 = {data['total']:.2f} / 12 = {monthly_value:.2f}"
+        data['monthly_value'] = monthly_value
+        return monthly_value
+
     monthly_merchants = {}   # Appears 6+ months
     annual_merchants = {}    # True annual bills (insurance, tax - once a year)
     periodic_merchants = {}  # Periodic recurring (tuition, quarterly payments)
     travel_merchants = {}    # Travel-related
     one_off_merchants = {}   # High-value infrequent
     variable_merchants = {}  # Discretionary
+    buckets = {
+        'monthly': monthly_merchants,
+        'annual': annual_merchants,
+        'periodic': periodic_merchants,
+        'travel': travel_merchants,
+        'one_off': one_off_merchants,
+        'variable': variable_merchants,
+    }
 
+    # Classify each merchant and compute its monthly value (using calc_type
+    # from the rule engine) in a single pass
     for merchant, data in by_merchant.items():
-        classification, calc_type, reasoning = classify_by_occurrence(merchant, data, num_months)
+        fields = (data['category'], data['subcategory'])
+        merchant_rules = rules_by_fields.get(fields)
+        if merchant_rules is None:
+            merchant_rules = rules_by_fields[fields] = rules_for_fields(classification_rules, *fields)
+        classification, calc_type, reasoning = classify_by_occurrence(
+            merchant, data, num_months, merchant_rules)
         # Store classification and calc_type in merchant data
         data['classification'] = classification
         data['calc_type'] = calc_type
         data['reasoning'] = reasoning
-        if classification == 'monthly':
-            monthly_merchants[merchant] = data
-        elif classification == 'annual':
-            annual_merchants[merchant] = data
-        elif classification == 'periodic':
-            periodic_merchants[merchant] = data
-        elif classification == 'travel':
-            travel_merchants[merchant] = data
-        elif classification == 'one_off':
-            one_off_merchants[merchant] = data
-        elif classification == 'variable':
-            variable_merchants[merchant] = data
+        bucket = buckets.get(classification)
+        if bucket is not None:  # Excluded merchants get no bucket or monthly value
+            bucket[merchant] = data
+            compute_monthly_value(data)
 
     # =========================================================================
     # CALCULATE TOTALS
@@ -704,42 +910,19 @@ def analyze_transactions(transactions):
     variable_total = sum(d['total'] for d in variable_merchants.values())
 
     # =========================================================================
-    # CALCULATE MONTHLY VALUES (using calc_type from rule engine)
+    # CALCULATE MONTHLY VALUES
     # =========================================================================
-
-    def compute_monthly_value(data):
-        """Compute monthly value based on calc_type from rule engine."""
-        calc_type = data.get('calc_type', '/12')
-        if calc_type == 'avg':
-            monthly_value = data.get('avg_when_active', data['total'] / max(data['months_active'], 1))
-            data['calc_reasoning'] = f"CV={data['cv']:.2f} (<0.3), using average when active"
-            data['calc_formula'] = f"avg_when_active = {data['total']:.2f} / {data['months_active']} months = {monthly_value:.2f}"
-        else:
-            monthly_value = data['total'] / 12
-            data['calc_reasoning'] = f"Spread over 12 months"
-            data['calc_formula'] = f"total / 12 = {data['total']:.2f} / 12 = {monthly_value:.2f}"
-        data['monthly_value'] = monthly_value
-        return monthly_value
-
-    # Compute monthly values for all buckets
-    monthly_avg = sum(compute_monthly_value(d) for d in monthly_merchants.values())
+    # fsum: exactly rounded, so the headline figures don't drift with merchant order
+    monthly_avg = math.fsum(d['monthly_value'] for d in monthly_merchants.values())
     annual_monthly = annual_total / 12
-    for data in annual_merchants.values():
-        compute_monthly_value(data)
     periodic_monthly = periodic_total / 12
-    for data in periodic_merchants.values():
-        compute_monthly_value(data)
-    for data in travel_merchants.values():
-        compute_monthly_value(data)
-    for data in one_off_merchants.values():
-        compute_monthly_value(data)
-    variable_monthly = sum(compute_monthly_value(d) for d in variable_merchants.values())
+    variable_monthly = math.fsum(d['monthly_value'] for d in variable_merchants.values())
 
     # Calculate totals only from non-excluded transactions
     included_transactions = [t for t in transactions if not t.get('excluded')]
 
     return {
-        'by_category': dict(by_category),
+        'by_category': by_category,
         'by_merchant': {k: dict(v) for k, v in by_merchant.items()},
         'by_month': dict(by_month),
         'total': sum(t['amount'] for t in included_transactions),
@@ -873,6 +1056,19 @@ def compute_section_totals(section_merchants):
 # EXPORT FUNCTIONS
 # ============================================================================
 
+# Merchant ID cleanup in one pass: drop quotes, spaces become underscores
+MERCHANT_ID_TABLE = str.maketrans({"'": None, '"': None, ' ': '_'})
+
+
+@lru_cache(maxsize=None)
+def make_merchant_id(name):
+    """Create a unique ID for merchant filtering (URL-safe, no quotes/spaces).
+
+    Cached: the same merchant names recur across sections and report writers.
+    """
+    return name.translate(MERCHANT_ID_TABLE)
+
+
 def build_merchant_json(merchant_name, data, verbose=0):
     """Build JSON representation of a merchant with reasoning based on verbosity level.
 
@@ -883,53 +1079,50 @@ def build_merchant_json(merchant_name, data, verbose=0):
 
     Returns: dict suitable for JSON serialization
     """
+    get = data.get  # Bound once; this runs for every merchant in an export
+
     # Handle tags - could be a set or list
-    tags = data.get('tags', [])
+    tags = get('tags', [])
     if isinstance(tags, set):
         tags = sorted(tags)
 
+    # Add reasoning (always include decision) and calculation info
+    reasoning = get('reasoning', {})
+    reasoning_json = {'decision': reasoning.get('decision', '')}
+    calculation = {'type': get('calc_type', ''), 'reason': get('calc_reasoning', '')}
+
     result = {
         'name': merchant_name,
-        'classification': data.get('classification', 'unknown'),
-        'category': data.get('category', ''),
-        'subcategory': data.get('subcategory', ''),
+        'classification': get('classification', 'unknown'),
+        'category': get('category', ''),
+        'subcategory': get('subcategory', ''),
         'tags': tags,
-        'total': round(data.get('total', 0), 2),
-        'count': data.get('count', 0),
-        'months_active': data.get('months_active', 0),
-        'monthly_value': round(data.get('monthly_value', 0), 2),
-    }
-
-    # Add reasoning (always include decision)
-    reasoning = data.get('reasoning', {})
-    result['reasoning'] = {
-        'decision': reasoning.get('decision', ''),
-    }
-
-    # Add calculation info
-    result['calculation'] = {
-        'type': data.get('calc_type', ''),
-        'reason': data.get('calc_reasoning', ''),
+        'total': round(get('total', 0), 2),
+        'count': get('count', 0),
+        'months_active': get('months_active', 0),
+        'monthly_value': round(get('monthly_value', 0), 2),
+        'reasoning': reasoning_json,
+        'calculation': calculation,
     }
 
     # Verbose: add decision trace and raw description variations
     if verbose >= 1:
-        result['reasoning']['trace'] = reasoning.get('trace', [])
-        raw_descs = data.get('raw_descriptions', {})
+        reasoning_json['trace'] = reasoning.get('trace', [])
+        raw_descs = get('raw_descriptions', {})
         if raw_descs:
             # Convert defaultdict to regular dict for JSON
             result['raw_descriptions'] = dict(raw_descs)
 
     # Very verbose: add thresholds, CV, and calculation formula
     if verbose >= 2:
-        result['reasoning']['thresholds'] = reasoning.get('thresholds', {})
-        result['reasoning']['cv'] = reasoning.get('cv', 0)
-        result['reasoning']['is_consistent'] = reasoning.get('is_consistent', True)
-        result['calculation']['formula'] = data.get('calc_formula', '')
-        result['months'] = data.get('months', [])
+        reasoning_json['thresholds'] = reasoning.get('thresholds', {})
+        reasoning_json['cv'] = reasoning.get('cv', 0)
+        reasoning_json['is_consistent'] = reasoning.get('is_consistent', True)
+        calculation['formula'] = get('calc_formula', '')
+        result['months'] = get('months', [])
 
     # Add pattern match info if available
-    match_info = data.get('match_info')
+    match_info = get('match_info')
     if match_info:
         result['pattern'] = {
             'matched': match_info.get('pattern', ''),
@@ -940,7 +1133,8 @@ def build_merchant_json(merchant_name, data, verbose=0):
     return result
 
 
-def export_json(stats, verbose=0, only=None, category_filter=None, merchant_filter=None):
+def export_json(stats, verbose=0, only=None, category_filter=None, merchant_filter=None,
+                compact=False, fp=None):
     """Export analysis results as JSON with reasoning.
 
     Args:
@@ -949,8 +1143,10 @@ def export_json(stats, verbose=0, only=None, category_filter=None, merchant_filt
         only: List of classifications to include (e.g., ['monthly', 'variable'])
         category_filter: Only include merchants in this category
         merchant_filter: Only include these merchants (list of names)
+        compact: Emit minified JSON (much faster to encode than indented output)
+        fp: Optional file object to write the JSON to instead of returning it
 
-    Returns: JSON string
+    Returns: JSON string, or None when written to fp
     """
     import json
 
@@ -980,6 +1176,7 @@ def export_json(stats, verbose=0, only=None, category_filter=None, merchant_filt
     # Classification sections to process
     all_sections = ['monthly', 'annual', 'periodic', 'travel', 'one_off', 'variable']
     sections = only if only else all_sections
+    merchant_filter = frozenset(merchant_filter) if merchant_filter else None
 
     for section in sections:
         if section not in all_sections:
@@ -997,10 +1194,15 @@ def export_json(stats, verbose=0, only=None, category_filter=None, merchant_filt
             merchants.append(build_merchant_json(name, data, verbose))
 
         # Sort by monthly value descending
-        merchants.sort(key=lambda x: x['monthly_value'], reverse=True)
+        merchants.sort(key=itemgetter('monthly_value'), reverse=True)
         output['classifications'][section] = merchants
 
-    return json.dumps(output, indent=2)
+    # Indented output goes through json's pure-Python encoder; compact uses the C one
+    options = {'separators': (',', ':')} if compact else {'indent': 2}
+    if fp is not None:
+        json.dump(output, fp, **options)
+        return None
+    return json.dumps(output, **options)
 
 
 def export_markdown(stats, verbose=0, only=None, category_filter=None, merchant_filter=None):
@@ -1034,6 +1236,7 @@ def export_markdown(stats, verbose=0, only=None, category_filter=None, merchant_
         'variable': 'Varies by Month',
     }
     sections = only if only else all_sections
+    merchant_filter = frozenset(merchant_filter) if merchant_filter else None
 
     for section in sections:
         if section not in all_sections:
@@ -1043,30 +1246,30 @@ def export_markdown(stats, verbose=0, only=None, category_filter=None, merchant_
             continue
 
         lines.append(f"\n## {section_names.get(section, section)}\n")
+        classification = section.replace('_', ' ').title()
 
-        # Sort by monthly value
+        # Apply filters, then sort what is left by monthly value
         sorted_merchants = sorted(
-            merchants_dict.items(),
+            ((name, data) for name, data in merchants_dict.items()
+             if not (category_filter and data.get('category') != category_filter)
+             and not (merchant_filter and name not in merchant_filter)),
             key=lambda x: x[1].get('monthly_value', 0),
             reverse=True
         )
 
         for name, data in sorted_merchants:
-            # Apply filters
-            if category_filter and data.get('category') != category_filter:
-                continue
-            if merchant_filter and name not in merchant_filter:
-                continue
-
             reasoning = data.get('reasoning', {})
 
-            lines.append(f"### {name}")
-            lines.append(f"**Classification:** {section.replace('_', ' ').title()}")
-            lines.append(f"**Reason:** {reasoning.get('decision', 'N/A')}")
-            lines.append(f"**Category:** {data.get('category', '')} > {data.get('subcategory', '')}")
-            lines.append(f"**Monthly Value:** ${data.get('monthly_value', 0):.2f}")
-            lines.append(f"**YTD Total:** ${data.get('total', 0):.2f}")
-            lines.append(f"**Months Active:** {data.get('months_active', 0)}/{stats['num_months']}")
+            # One multi-line entry per merchant header (lines are joined with newlines)
+            lines.append(
+                f"### {name}\n"
+                f"**Classification:** {classification}\n"
+                f"**Reason:** {reasoning.get('decision', 'N/A')}\n"
+                f"**Category:** {data.get('category', '')} > {data.get('subcategory', '')}\n"
+                f"**Monthly Value:** ${data.get('monthly_value', 0):.2f}\n"
+                f"**YTD Total:** ${data.get('total', 0):.2f}\n"
+                f"**Months Active:** {data.get('months_active', 0)}/{stats['num_months']}"
+            )
 
             # Verbose: add decision trace
             if verbose >= 1:
@@ -1092,9 +1295,19 @@ def export_markdown(stats, verbose=0, only=None, category_filter=None, merchant_
 
 def print_summary(stats, year=2025, filter_category=None, currency_format="${amount}"):
     """Print analysis summary."""
+    # Lines are collected and written to stdout in one call at the end
+    lines = []
+    out = lines.append
+
     # Local helper for currency formatting
+    # Totals recur across the summary and the tables, so format each once
+    formatted = {}
+
     def fmt(amount):
-        return format_currency(amount, currency_format)
+        text = formatted.get(amount)
+        if text is None:
+            text = formatted[amount] = format_currency(amount, currency_format)
+        return text
 
     by_category = stats['by_category']
     monthly_merchants = stats['monthly_merchants']
@@ -1114,36 +1327,36 @@ def print_summary(stats, year=2025, filter_category=None, currency_format="${amo
     # =========================================================================
     # MONTHLY BUDGET SUMMARY
     # =========================================================================
-    print("=" * 80)
-    print(f"{year} SPENDING ANALYSIS (Occurrence-Based)")
-    print("=" * 80)
-
-    print("\nMONTHLY BUDGET")
-    print("-" * 50)
-    print(f"Every Month (6+ mo):         {fmt(stats['monthly_avg']):>14}/mo")
-    print(f"Varies by Month:             {fmt(stats['variable_monthly']):>14}/mo")
-    print(f"                             {'-'*14}")
-    print(f"TRUE MONTHLY BUDGET:         {fmt(stats['monthly_avg'] + stats['variable_monthly']):>14}/mo")
-    print()
-    print("NON-RECURRING (YTD)")
-    print("-" * 50)
-    print(f"Once a Year:                 {fmt(stats['annual_total']):>14}")
-    print(f"A Few Times/Year:            {fmt(stats['periodic_total']):>14}")
-    print(f"Travel Expenses:             {fmt(stats['travel_total']):>14}")
-    print(f"Large One-Time:              {fmt(stats['one_off_total']):>14}")
-    print(f"                             {'-'*14}")
-    print(f"Total Non-Recurring:         {fmt(stats['annual_total'] + stats['periodic_total'] + stats['travel_total'] + stats['one_off_total']):>14}")
-    print()
-    print(f"TOTAL SPENDING (YTD):        {fmt(actual_spending):>14}")
+    out("=" * 80)
+    out(f"{year} SPENDING ANALYSIS (Occurrence-Based)")
+    out("=" * 80)
+
+    out("\nMONTHLY BUDGET")
+    out("-" * 50)
+    out(f"Every Month (6+ mo):         {fmt(stats['monthly_avg']):>14}/mo")
+    out(f"Varies by Month:             {fmt(stats['variable_monthly']):>14}/mo")
+    out(f"                             {'-'*14}")
+    out(f"TRUE MONTHLY BUDGET:         {fmt(stats['monthly_avg'] + stats['variable_monthly']):>14}/mo")
+    out('')
+    out("NON-RECURRING (YTD)")
+    out("-" * 50)
+    out(f"Once a Year:                 {fmt(stats['annual_total']):>14}")
+    out(f"A Few Times/Year:            {fmt(stats['periodic_total']):>14}")
+    out(f"Travel Expenses:             {fmt(stats['travel_total']):>14}")
+    out(f"Large One-Time:              {fmt(stats['one_off_total']):>14}")
+    out(f"                             {'-'*14}")
+    out(f"Total Non-Recurring:         {fmt(stats['annual_total'] + stats['periodic_total'] + stats['travel_total'] + stats['one_off_total']):>14}")
+    out('')
+    out(f"TOTAL SPENDING (YTD):        {fmt(actual_spending):>14}")
 
     # =========================================================================
     # EVERY MONTH (6+ months)
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("EVERY MONTH (Appears 6+ Months)")
-    print("=" * 80)
-    print(f"\n{'Merchant':<26} {'Mo':>3} {'Type':<6} {'Monthly':>10} {'YTD':>12}")
-    print("-" * 62)
+    out("\n" + "=" * 80)
+    out("EVERY MONTH (Appears 6+ Months)")
+    out("=" * 80)
+    out(f"\n{'Merchant':<26} {'Mo':>3} {'Type':<6} {'Monthly':>10} {'YTD':>12}")
+    out("-" * 62)
 
     sorted_monthly = sorted(monthly_merchants.items(),
         key=lambda x: x[1]['avg_when_active'] if x[1]['is_consistent'] else x[1]['total']/12,
@@ -1155,95 +1368,98 @@ def print_summary(stats, year=2025, filter_category=None, currency_format="${amo
         else:
             calc_type = "/12"
             monthly = data['total'] / 12
-        print(f"{merchant:<26} {data['months_active']:>3} {calc_type:<6} {fmt(monthly):>12} {fmt(data['total']):>14}")
+        out(f"{merchant:<26} {data['months_active']:>3} {calc_type:<6} {fmt(monthly):>12} {fmt(data['total']):>14}")
 
-    print(f"\n{'TOTAL':<26} {'':<3} {'':<6} {fmt(stats['monthly_avg']):>12}/mo {fmt(stats['monthly_total']):>14}")
+    out(f"\n{'TOTAL':<26} {'':<3} {'':<6} {fmt(stats['monthly_avg']):>12}/mo {fmt(stats['monthly_total']):>14}")
 
     # =========================================================================
     # ONCE A YEAR
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("ONCE A YEAR")
-    print("=" * 80)
-    print(f"\n{'Merchant':<28} {'Category':<15} {'Total':>12}")
-    print("-" * 58)
+    out("\n" + "=" * 80)
+    out("ONCE A YEAR")
+    out("=" * 80)
+    out(f"\n{'Merchant':<28} {'Category':<15} {'Total':>12}")
+    out("-" * 58)
 
     sorted_annual = sorted(annual_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
     for merchant, data in sorted_annual:
-        print(f"{merchant:<28} {data['subcategory']:<15} {fmt(data['total']):>14}")
+        out(f"{merchant:<28} {data['subcategory']:<15} {fmt(data['total']):>14}")
 
-    print(f"\n{'TOTAL':<28} {'':<15} {fmt(stats['annual_total']):>14}")
+    out(f"\n{'TOTAL':<28} {'':<15} {fmt(stats['annual_total']):>14}")
 
     # =========================================================================
     # A FEW TIMES/YEAR
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("A FEW TIMES/YEAR")
-    print("=" * 80)
-    print(f"\n{'Merchant':<28} {'Category':<15} {'Count':>6} {'Total':>12}")
-    print("-" * 65)
+    out("\n" + "=" * 80)
+    out("A FEW TIMES/YEAR")
+    out("=" * 80)
+    out(f"\n{'Merchant':<28} {'Category':<15} {'Count':>6} {'Total':>12}")
+    out("-" * 65)
 
     sorted_periodic = sorted(periodic_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
     for merchant, data in sorted_periodic:
-        print(f"{merchant:<28} {data['subcategory']:<15} {data['count']:>6} {fmt(data['total']):>14}")
+        out(f"{merchant:<28} {data['subcategory']:<15} {data['count']:>6} {fmt(data['total']):>14}")
 
-    print(f"\n{'TOTAL':<28} {'':<15} {'':<6} {fmt(stats['periodic_total']):>14}")
+    out(f"\n{'TOTAL':<28} {'':<15} {'':<6} {fmt(stats['periodic_total']):>14}")
 
     # =========================================================================
     # TRAVEL EXPENSES
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("TRAVEL EXPENSES")
-    print("=" * 80)
-    print(f"\n{'Merchant':<28} {'Category':<15} {'Count':>6} {'Total':>12}")
-    print("-" * 65)
+    out("\n" + "=" * 80)
+    out("TRAVEL EXPENSES")
+    out("=" * 80)
+    out(f"\n{'Merchant':<28} {'Category':<15} {'Count':>6} {'Total':>12}")
+    out("-" * 65)
 
     sorted_travel = sorted(travel_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
     for merchant, data in sorted_travel[:15]:
-        print(f"{merchant:<28} {data['category']:<15} {data['count']:>6} {fmt(data['total']):>14}")
+        out(f"{merchant:<28} {data['category']:<15} {data['count']:>6} {fmt(data['total']):>14}")
 
-    print(f"\n{'TOTAL TRAVEL':<28} {'':<15} {'':<6} {fmt(stats['travel_total']):>14}")
+    out(f"\n{'TOTAL TRAVEL':<28} {'':<15} {'':<6} {fmt(stats['travel_total']):>14}")
 
     # =========================================================================
     # LARGE ONE-TIME
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("LARGE ONE-TIME")
-    print("=" * 80)
-    print(f"\n{'Merchant':<28} {'Category':<15} {'Total':>12}")
-    print("-" * 58)
+    out("\n" + "=" * 80)
+    out("LARGE ONE-TIME")
+    out("=" * 80)
+    out(f"\n{'Merchant':<28} {'Category':<15} {'Total':>12}")
+    out("-" * 58)
 
     sorted_oneoff = sorted(one_off_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
     for merchant, data in sorted_oneoff[:15]:
-        print(f"{merchant:<28} {data['category']:<15} {fmt(data['total']):>14}")
+        out(f"{merchant:<28} {data['category']:<15} {fmt(data['total']):>14}")
 
-    print(f"\n{'TOTAL ONE-OFF':<28} {'':<15} {fmt(stats['one_off_total']):>14}")
+    out(f"\n{'TOTAL ONE-OFF':<28} {'':<15} {fmt(stats['one_off_total']):>14}")
 
     # =========================================================================
     # VARIES BY MONTH
     # =========================================================================
-    print("\n" + "=" * 80)
-    print("VARIES BY MONTH")
-    print("=" * 80)
-    print(f"\n{'Category':<18} {'Subcategory':<15} {'Months':>6} {'Avg/Mo':>10} {'YTD':>12}")
-    print("-" * 70)
+    out("\n" + "=" * 80)
+    out("VARIES BY MONTH")
+    out("=" * 80)
+    out(f"\n{'Category':<18} {'Subcategory':<15} {'Months':>6} {'Avg/Mo':>10} {'YTD':>12}")
+    out("-" * 70)
 
     # Group variable merchants by category
     variable_by_cat = defaultdict(lambda: {'total': 0, 'months': set()})
-    for merchant, data in variable_merchants.items():
-        key = (data['category'], data['subcategory'])
-        variable_by_cat[key]['total'] += data['total']
-        variable_by_cat[key]['months'].update(data['months'])
+    for data in variable_merchants.values():
+        entry = variable_by_cat[(data['category'], data['subcategory'])]
+        entry['total'] += data['total']
+        entry['months'].update(data['months'])
 
     sorted_var_cats = sorted(variable_by_cat.items(), key=lambda x: x[1]['total'], reverse=True)
+    wanted_category = filter_category.lower() if filter_category else None
     for (cat, subcat), info in sorted_var_cats[:20]:
-        if filter_category and cat.lower() != filter_category.lower():
+        if wanted_category and cat.lower() != wanted_category:
             continue
         months_active = len(info['months'])
         avg = info['total'] / months_active if months_active > 0 else 0
-        print(f"{cat:<18} {subcat:<15} {months_active:>6} {fmt(avg):>12} {fmt(info['total']):>14}")
+        out(f"{cat:<18} {subcat:<15} {months_active:>6} {fmt(avg):>12} {fmt(info['total']):>14}")
 
-    print(f"\n{'TOTAL VARIABLE':<18} {'':<15} {'':<6} {fmt(stats['variable_monthly']):>12}/mo {fmt(stats['variable_total']):>14}")
+    out(f"\n{'TOTAL VARIABLE':<18} {'':<15} {'':<6} {fmt(stats['variable_monthly']):>12}/mo {fmt(stats['variable_total']):>14}")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def print_sections_summary(stats, year=2025, currency_format="${amount}", only_filter=None):
@@ -1324,14 +1540,20 @@ def print_sections_summary(stats, year=2025, currency_format="${amount}", only_f
     print("=" * 80)
 
 
+@lru_cache(maxsize=1)
+def _embedding_model():
+    """Load the sentence-transformers model once per process."""
+    # Use a small, fast model optimized for semantic similarity
+    return SentenceTransformer('all-MiniLM-L6-v2')
+
+
 def generate_embeddings(items):
     """Generate embeddings for a list of text items using sentence-transformers."""
     if not EMBEDDINGS_AVAILABLE:
         return None
 
     print("Generating semantic embeddings...")
-    # Use a small, fast model optimized for semantic similarity
-    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model = _embedding_model()
     embeddings = model.encode(items, show_progress_bar=False)
     return embeddings.tolist()
 
@@ -1353,9 +1575,9 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
 
     # Load template files
     template_dir = get_template_dir()
-    html_template = (template_dir / 'spending_report.html').read_text(encoding='utf-8')
-    css_content = (template_dir / 'spending_report.css').read_text(encoding='utf-8')
-    js_content = (template_dir / 'spending_report.js').read_text(encoding='utf-8')
+    html_template = read_template(template_dir / 'spending_report.html')
+    css_content = read_template(template_dir / 'spending_report.css')
+    js_content = read_template(template_dir / 'spending_report.js')
 
     # Extract merchant dicts
     monthly_merchants = stats['monthly_merchants']
@@ -1368,36 +1590,41 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
     # Get number of months for averaging
     num_months = stats['num_months']
 
-    # Helper function to create merchant IDs
-    def make_merchant_id(name):
-        return name.replace("'", "").replace('"', '').replace(' ', '_')
+    # Lowercased "category/subcategory" filter path, built once per pair
+    category_paths = {}
+
+    def category_path(category, subcategory):
+        path = category_paths.get((category, subcategory))
+        if path is None:
+            path = category_paths[(category, subcategory)] = f"{category}/{subcategory}".lower()
+        return path
 
     # Build section merchants data
     def build_section_merchants(merchant_dict):
         merchants = {}
         for merchant_name, data in merchant_dict.items():
             merchant_id = make_merchant_id(merchant_name)
+            tags = data.get('tags')
 
             # Build transactions array with unique IDs
-            txns = []
-            for i, txn in enumerate(data.get('transactions', [])):
-                txns.append({
-                    'id': f"{merchant_id}_{i}",
-                    'date': txn.get('date', ''),
-                    'month': txn.get('month', ''),
-                    'description': txn.get('description', ''),
-                    'amount': txn.get('amount', 0),
-                    'source': txn.get('source', ''),
-                    'location': txn.get('location'),
-                    'tags': txn.get('tags', [])
-                })
+            id_prefix = merchant_id + '_'
+            txns = [{
+                'id': id_prefix + str(i),
+                'date': txn.get('date', ''),
+                'month': txn.get('month', ''),
+                'description': txn.get('description', ''),
+                'amount': txn.get('amount', 0),
+                'source': txn.get('source', ''),
+                'location': txn.get('location'),
+                'tags': txn.get('tags', [])
+            } for i, txn in enumerate(data.get('transactions', ()))]
 
             merchants[merchant_id] = {
                 'id': merchant_id,
                 'displayName': merchant_name,
                 'category': data.get('category', 'Other'),
                 'subcategory': data.get('subcategory', 'Uncategorized'),
-                'categoryPath': f"{data.get('category', 'Other')}/{data.get('subcategory', 'Uncategorized')}".lower(),
+                'categoryPath': category_path(data.get('category', 'Other'), data.get('subcategory', 'Uncategorized')),
                 'calcType': data.get('calc_type', '/12'),
                 'monthsActive': data.get('months_active', 0),
                 'isConsistent': data.get('is_consistent', False),
@@ -1405,7 +1632,7 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
                 'monthly': data.get('avg_when_active') or (data.get('total', 0) / num_months if num_months > 0 else 0),
                 'count': data.get('count', len(txns)),
                 'transactions': txns,
-                'tags': sorted(data.get('tags', set())),  # Convert set to sorted list
+                'tags': sorted(tags) if tags else [],  # Convert set to sorted list
             }
         return merchants
 
@@ -1447,13 +1674,13 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
     home_state = list(home_locations)[0] if home_locations else 'WA'
 
     # Calculate data through date (latest transaction date)
-    latest_date = ''
-    for merchant_dict in [monthly_merchants, annual_merchants, periodic_merchants,
-                          travel_merchants, one_off_merchants, variable_merchants]:
-        for data in merchant_dict.values():
-            for txn in data.get('transactions', []):
-                if txn.get('date', '') > latest_date:
-                    latest_date = txn.get('date', '')
+    latest_date = max(
+        (txn.get('date', '')
+         for merchant_dict in (monthly_merchants, annual_merchants, periodic_merchants,
+                               travel_merchants, one_off_merchants, variable_merchants)
+         for data in merchant_dict.values()
+         for txn in data.get('transactions', ())),
+        default='')
 
     # Build category view - group all merchants by category -> subcategory
     def build_category_view():
@@ -1528,8 +1755,9 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
         'excludedTotal': stats.get('excluded_total', 0),
     }
 
-    # Assemble final HTML
-    data_script = f'window.spendingData = {json.dumps(spending_data)};'
+    # Assemble final HTML. The data is the bulk of the report, so it is encoded
+    # compactly and written straight to the file rather than spliced into the page.
+    data_json = dumps_compact(spending_data)
 
     if not embedded_html:
         # Write separate files for easier development
@@ -1546,7 +1774,10 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
 
         # Write data file
         data_path = output_dir / 'spending_data.js'
-        data_path.write_text(data_script, encoding='utf-8')
+        with open(data_path, 'w', encoding='utf-8') as f:
+            f.write('window.spendingData = ')
+            f.write(data_json)
+            f.write(';')
 
         # Create HTML with external references
         final_html = html_template.replace(
@@ -1559,18 +1790,16 @@ def write_summary_file_vue(stats, filepath, year=2025, home_locations=None, curr
             '<script>/* JS_PLACEHOLDER */</script>',
             '<script src="spending_report.js"></script>'
         )
+        Path(filepath).write_text(final_html, encoding='utf-8')
     else:
         # Embed everything inline (default)
-        final_html = html_template.replace(
-            '/* CSS_PLACEHOLDER */', css_content
-        ).replace(
-            '/* DATA_PLACEHOLDER */', data_script
-        ).replace(
-            '/* JS_PLACEHOLDER */', js_content
-        )
-
-    # Write output file
-    Path(filepath).write_text(final_html, encoding='utf-8')
+        before_data, after_data = html_template.split('/* DATA_PLACEHOLDER */', 1)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(before_data.replace('/* CSS_PLACEHOLDER */', css_content))
+            f.write('window.spendingData = ')
+            f.write(data_json)
+            f.write(';')
+            f.write(after_data.replace('/* JS_PLACEHOLDER */', js_content))
 
 
 def write_summary_file(stats, filepath, year=2025, home_locations=None, currency_format="${amount}"):
@@ -1587,19 +1816,26 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
 
     # Load external CSS and JavaScript files for embedding
     template_dir = get_template_dir()
-    css_file_path = template_dir / 'spending_report.css'
-    with open(css_file_path, 'r', encoding='utf-8') as f:
-        spending_report_css = f.read()
+    spending_report_css = read_template(template_dir / 'spending_report.css')
+    spending_report_js = read_template(template_dir / 'spending_report.js')
 
-    js_file_path = template_dir / 'spending_report.js'
-    with open(js_file_path, 'r', encoding='utf-8') as f:
-        spending_report_js = f.read()
+    # Local helpers for currency formatting. Recurring charges repeat the same
+    # amounts across many transaction rows, so each is formatted once.
+    formatted = {}
+    formatted_dec = {}
 
-    # Local helpers for currency formatting
     def fmt(amount):
-        return format_currency(amount, currency_format)
+        text = formatted.get(amount)
+        if text is None:
+            text = formatted[amount] = format_currency(amount, currency_format)
+        return text
+
     def fmt_dec(amount):
-        return format_currency_decimal(amount, currency_format)
+        text = formatted_dec.get(amount)
+        if text is None:
+            text = formatted_dec[amount] = format_currency_decimal(amount, currency_format)
+        return text
+
     by_category = stats['by_category']
     monthly_merchants = stats['monthly_merchants']
     annual_merchants = stats['annual_merchants']
@@ -1611,13 +1847,8 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
     excluded = {'Transfers', 'Cash'}
     actual = sum(d['total'] for (c, s), d in by_category.items() if c not in excluded)
     uncat = by_category.get(('Other', 'Uncategorized'), {'total': 0})['total']
-
-    # Group variable by category
-    variable_by_cat = defaultdict(lambda: {'total': 0, 'months': set()})
-    for merchant, data in variable_merchants.items():
-        key = (data['category'], data['subcategory'])
-        variable_by_cat[key]['total'] += data['total']
-        variable_by_cat[key]['months'].update(data['months'])
+    # Multiplier for "share of actual spending" percentages (0 when nothing was spent)
+    pct_of_actual = 100.0 / actual if actual else 0.0
 
     # Collect all unique categories and subcategories for dropdown
     all_categories = set()
@@ -1626,59 +1857,45 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
             all_categories.add(cat)
             if sub:
                 all_categories.add(sub)
-    for data in monthly_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    for data in annual_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    for data in periodic_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    for data in variable_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    for data in travel_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    for data in one_off_merchants.values():
-        if data.get('category'):
-            all_categories.add(data['category'])
-        if data.get('subcategory'):
-            all_categories.add(data['subcategory'])
-    sorted_categories = sorted(all_categories)
 
-    # Collect all unique merchants for autocomplete
+    # One pass over every classified merchant collects the categories, merchants
+    # and locations for autocomplete (locations historically skip periodic
+    # merchants) along with the chart data below: the monthly spending trend,
+    # calculated from classified merchants to match YTD totals, and the
+    # per-category monthly breakdown.
     all_merchants = set()
-    for merchant in monthly_merchants.keys():
-        all_merchants.add(merchant)
-    for merchant in annual_merchants.keys():
-        all_merchants.add(merchant)
-    for merchant in periodic_merchants.keys():
-        all_merchants.add(merchant)
-    for merchant in travel_merchants.keys():
-        all_merchants.add(merchant)
-    for merchant in one_off_merchants.keys():
-        all_merchants.add(merchant)
-    for merchant in variable_merchants.keys():
-        all_merchants.add(merchant)
+    all_locations = set()
+    spending_by_month = defaultdict(float)
+    category_monthly_totals = {}
+    for merchants, collect_locations in (
+            (monthly_merchants, True), (annual_merchants, True), (periodic_merchants, False),
+            (travel_merchants, True), (one_off_merchants, True), (variable_merchants, True)):
+        for merchant, data in merchants.items():
+            all_merchants.add(merchant)
+            if data.get('category'):
+                all_categories.add(data['category'])
+            if data.get('subcategory'):
+                all_categories.add(data['subcategory'])
+            if collect_locations:
+                for txn in data.get('transactions', []):
+                    if txn.get('location'):
+                        all_locations.add(txn['location'])
+
+            monthly_amounts = data.get('monthly_amounts')
+            if not monthly_amounts:
+                continue
+            category = data.get('category', 'Other')
+            category_months = category_monthly_totals.get(category)
+            if category_months is None:
+                category_months = category_monthly_totals[category] = defaultdict(float)
+            for month, amount in monthly_amounts.items():
+                spending_by_month[month] += amount
+                category_months[month] += amount
+    sorted_categories = sorted(all_categories)
     sorted_merchants = sorted(all_merchants)
+    sorted_locations = sorted(all_locations)
 
     # Helper functions to create consistent IDs for filtering
-    def make_merchant_id(name):
-        """Create a unique ID for merchant filtering (URL-safe, no quotes/spaces)."""
-        return name.replace("'", "").replace('"', '').replace(' ', '_')
-
     def make_category_id(name):
         """Create a unique ID for category filtering (lowercase)."""
         return name.lower() if name else ''
@@ -1687,34 +1904,10 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         """Create a unique ID for location filtering (lowercase)."""
         return code.lower() if code else ''
 
-    # Collect all unique locations for autocomplete
-    all_locations = set()
-    for data in monthly_merchants.values():
-        for txn in data.get('transactions', []):
-            if txn.get('location'):
-                all_locations.add(txn['location'])
-    for data in annual_merchants.values():
-        for txn in data.get('transactions', []):
-            if txn.get('location'):
-                all_locations.add(txn['location'])
-    for data in travel_merchants.values():
-        for txn in data.get('transactions', []):
-            if txn.get('location'):
-                all_locations.add(txn['location'])
-    for data in one_off_merchants.values():
-        for txn in data.get('transactions', []):
-            if txn.get('location'):
-                all_locations.add(txn['location'])
-    for data in variable_merchants.values():
-        for txn in data.get('transactions', []):
-            if txn.get('location'):
-                all_locations.add(txn['location'])
-    sorted_locations = sorted(all_locations)
-
     # Generate embeddings for semantic search
     all_searchable = list(sorted_categories) + list(sorted_merchants)
     embeddings = generate_embeddings(all_searchable)
-    embeddings_json = json.dumps({
+    embeddings_json = dumps_compact({
         'items': all_searchable,
         'vectors': embeddings
     }) if embeddings else 'null'
@@ -1725,17 +1918,28 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
     # US states set for location classification
     us_states = {'AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA','KS','KY','LA','ME','MD','MA','MI','MN','MS','MO','MT','NE','NV','NH','NJ','NM','NY','NC','ND','OH','OK','OR','PA','RI','SC','SD','TN','TX','UT','VT','VA','WA','WV','WI','WY','DC'}
 
+    # Badge HTML per location; a report has few locations but many transaction rows
+    location_badges = {}
+
     def location_badge(loc):
         """Generate HTML for location badge."""
         if not loc:
             return ''
-        onclick = f"addFilterFromCell(event, this, 'location')"
-        if loc in home_locations:
-            return f'<span class="txn-location home clickable" onclick="{onclick}">{loc}</span>'
-        elif loc not in us_states:
-            return f'<span class="txn-location intl clickable" onclick="{onclick}">{loc}</span>'
-        else:
-            return f'<span class="txn-location clickable" onclick="{onclick}">{loc}</span>'
+        badge = location_badges.get(loc)
+        if badge is None:
+            if loc in home_locations:
+                css_class = 'txn-location home clickable'
+            elif loc not in us_states:
+                css_class = 'txn-location intl clickable'
+            else:
+                css_class = 'txn-location clickable'
+            badge = location_badges[loc] = (
+                f'<span class="{css_class}" onclick="addFilterFromCell(event, this, \'location\')">{loc}</span>'
+            )
+        return badge
+
+    # Sort key for transaction detail rows (newest first)
+    by_date = itemgetter('date')
 
     # Generate embedded JSON for LLM tools (full verbosity for programmatic access)
     import json
@@ -1745,23 +1949,13 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
     assets_dir = Path(__file__).parent / 'assets'
     chart_js_path = assets_dir / 'chart.min.js'
     if chart_js_path.exists():
-        chart_js_content = chart_js_path.read_text(encoding='utf-8')
+        chart_js_content = read_template(chart_js_path)
     else:
         chart_js_content = '// Chart.js not found - charts will not render'
 
     # Prepare chart data
-    # 1. Monthly spending trend (excluding Transfers and Cash)
-    # Calculate from classified merchants to match YTD totals
-    spending_by_month = defaultdict(float)
-    all_merchant_dicts = [
-        monthly_merchants, annual_merchants, periodic_merchants,
-        travel_merchants, one_off_merchants, variable_merchants
-    ]
-    for merchants in all_merchant_dicts:
-        for merchant, data in merchants.items():
-            for month, amount in data.get('monthly_amounts', {}).items():
-                spending_by_month[month] += amount
-
+    # 1. Monthly spending trend (excluding Transfers and Cash), from
+    # spending_by_month collected above
     sorted_months = sorted(spending_by_month.keys())
     monthly_labels = [datetime.strptime(m, '%Y-%m').strftime('%b %Y') for m in sorted_months]
     monthly_totals = [spending_by_month[m] for m in sorted_months]
@@ -1781,24 +1975,21 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
 
         options = []
 
-        # Get unique years from the months
-        years = sorted(set(m.split('-')[0] for m in months_list), reverse=True)
+        # Bucket the months into (year, quarter) pairs in one pass
+        present_quarters = set()
+        for m in months_list:
+            yr, mo = m.split('-')
+            present_quarters.add((yr, (int(mo) - 1) // 3 + 1))
+        years = sorted({yr for yr, _ in present_quarters}, reverse=True)
 
         # Generate quarter options
-        quarter_options = []
-        for yr in years:
-            quarters = [
-                (f"{yr}-10..{yr}-12", f"Q4 {yr}"),
-                (f"{yr}-07..{yr}-09", f"Q3 {yr}"),
-                (f"{yr}-04..{yr}-06", f"Q2 {yr}"),
-                (f"{yr}-01..{yr}-03", f"Q1 {yr}"),
-            ]
-            for value, label in quarters:
-                # Check if any months in this quarter exist in data
-                start, end = value.split('..')
-                quarter_months = [m for m in months_list if start <= m <= end]
-                if quarter_months:
-                    quarter_options.append(f'                    <option value="{value}">{label}</option>')
+        quarter_ranges = ((4, '10', '12'), (3, '07', '09'), (2, '04', '06'), (1, '01', '03'))
+        quarter_options = [
+            f'                    <option value="{yr}-{start}..{yr}-{end}">Q{q} {yr}</option>'
+            for yr in years
+            for q, start, end in quarter_ranges
+            if (yr, q) in present_quarters
+        ]
 
         if quarter_options:
             options.append('                <optgroup label="Quarters">')
@@ -1821,35 +2012,29 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
 
     date_picker_options = generate_date_options(sorted_months)
     
-    # 2. Category breakdown by month - build spending per category per month
-    # Build category breakdown from merchant data using monthly_amounts dict
-    category_monthly_totals = defaultdict(lambda: defaultdict(float))
-    for merchant_dict in [monthly_merchants, annual_merchants, periodic_merchants,
-                          travel_merchants, one_off_merchants, variable_merchants]:
-        for merchant, data in merchant_dict.items():
-            category = data.get('category', 'Other')
-            for month, amount in data.get('monthly_amounts', {}).items():
-                category_monthly_totals[category][month] += amount
-    
+    # 2. Category breakdown by month (category_monthly_totals, built above)
     # Prepare data for category breakdown chart
     top_categories = ['Food', 'Shopping', 'Transport', 'Bills', 'Subscriptions', 
                       'Health', 'Travel', 'Home', 'Personal']
     category_datasets = []
     
     for cat in top_categories:
-        if cat in category_monthly_totals:
-            cat_data = [category_monthly_totals[cat].get(m, 0) for m in sorted_months]
-            if sum(cat_data) > 0:  # Only include if has data
-                category_datasets.append({
-                    'label': cat,
-                    'data': cat_data
-                })
+        cat_months = category_monthly_totals.get(cat)
+        if not cat_months:
+            continue
+        cat_data = [cat_months.get(m, 0) for m in sorted_months]
+        # Only include if has data (a net sum, so refunds can cancel a category out)
+        if sum(cat_data) > 0:
+            category_datasets.append({
+                'label': cat,
+                'data': cat_data
+            })
     
     # 3. Category pie chart data
-    category_totals = {}
+    category_totals = defaultdict(float)
     for (cat, subcat), data in by_category.items():
         if cat not in excluded:
-            category_totals[cat] = category_totals.get(cat, 0) + data['total']
+            category_totals[cat] += data['total']
     
     # Sort by total and take top 8 categories
     sorted_categories_by_total = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)
@@ -1857,7 +2042,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
     pie_data = [total for _, total in sorted_categories_by_total[:8]]
     
     # Convert chart data to JSON
-    chart_data_json = json.dumps({
+    chart_data_json = dumps_compact({
         'monthly': {
             'labels': monthly_labels,
             'data': monthly_totals
@@ -1881,19 +2066,12 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         for merchant_name, data in merchant_dict.items():
             merchant_id = make_merchant_id(merchant_name)
             section_total += data['total']
+            tags = data.get('tags')
 
-            # Build transactions array
-            txns = []
-            for txn in data.get('transactions', []):
-                txns.append({
-                    'date': txn.get('date', ''),
-                    'month': txn.get('month', ''),
-                    'description': txn.get('description', ''),
-                    'amount': txn.get('amount', 0),
-                    'source': txn.get('source', ''),
-                    'location': txn.get('location'),
-                    'tags': txn.get('tags', [])
-                })
+            # Transactions are serialized as-is: analyze_transactions already stores
+            # them with exactly the fields the page reads, and section_data is
+            # encoded below without being modified.
+            txns = data.get('transactions', [])
 
             merchants[merchant_id] = {
                 'id': merchant_id,
@@ -1908,7 +2086,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                 'monthly': data.get('avg_when_active') or (data.get('total', 0) / num_months if num_months > 0 else 0),
                 'count': data.get('count', 0),
                 'transactions': txns,
-                'tags': sorted(data.get('tags', set())),  # Convert set to sorted list
+                'tags': sorted(tags) if tags else [],  # Convert set to sorted list
             }
         return merchants, section_total
 
@@ -1954,9 +2132,12 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         'totalYtd': actual
     }
 
-    section_data_json = json.dumps(section_data)
+    section_data_json = dumps_compact(section_data)
 
-    html = f'''<!DOCTYPE html>
+    # Collect the page as fragments and write them out in one go
+    parts = []
+    out = parts.append
+    out(f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -1992,7 +2173,13 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
     </script>
     <script type="module">
         // Load Transformers.js for semantic search
-        import {{ pipeline }} from 'https://cdn.jsdelivr.net/npm/@xenova/transformers@2.17.2';
+        import {{ pipeline, env }} from 'https://cdn.jsdelivr.net/npm/@xenova/transformers@2.17.2';
+
+        // Fetch the model from the hub once and serve it from Cache Storage on
+        // later loads; skip probing for local model files next to the report
+        env.allowLocalModels = false;
+        env.allowRemoteModels = true;
+        env.useBrowserCache = true;
 
         window.initSemanticSearch = async function() {{
             if (!window.embeddingsData || !window.embeddingsData.vectors) {{
@@ -2071,34 +2258,34 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                 <div class="breakdown">
                     <div class="breakdown-item">
                         <span class="name">Monthly Recurring</span>
-                        <span class="value">{fmt(stats['monthly_avg'])} <span class="breakdown-pct">({stats['monthly_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['monthly_avg'])} <span class="breakdown-pct">({stats['monthly_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                     <div class="breakdown-item">
                         <span class="name" data-tooltip="Sum of Avg/Mo values from variable spending">Variable/Discretionary</span>
-                        <span class="value">{fmt(stats['variable_monthly'])} <span class="breakdown-pct">({stats['variable_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['variable_monthly'])} <span class="breakdown-pct">({stats['variable_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                 </div>
             </div>
 
             <div class="card non-recurring">
                 <h2>Non-Recurring (YTD)</h2>
-                <div class="amount">{fmt(non_recurring_total)} <span class="breakdown-pct">({non_recurring_total/actual*100:.1f}%)</span></div>
+                <div class="amount">{fmt(non_recurring_total)} <span class="breakdown-pct">({non_recurring_total * pct_of_actual:.1f}%)</span></div>
                 <div class="breakdown">
                     <div class="breakdown-item">
                         <span class="name">Annual Bills</span>
-                        <span class="value">{fmt(stats['annual_total'])} <span class="breakdown-pct">({stats['annual_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['annual_total'])} <span class="breakdown-pct">({stats['annual_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                     <div class="breakdown-item">
                         <span class="name">Periodic Recurring</span>
-                        <span class="value">{fmt(stats['periodic_total'])} <span class="breakdown-pct">({stats['periodic_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['periodic_total'])} <span class="breakdown-pct">({stats['periodic_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                     <div class="breakdown-item">
                         <span class="name">Travel/Trips</span>
-                        <span class="value">{fmt(stats['travel_total'])} <span class="breakdown-pct">({stats['travel_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['travel_total'])} <span class="breakdown-pct">({stats['travel_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                     <div class="breakdown-item">
                         <span class="name">One-Off Purchases</span>
-                        <span class="value">{fmt(stats['one_off_total'])} <span class="breakdown-pct">({stats['one_off_total']/actual*100:.1f}%)</span></span>
+                        <span class="value">{fmt(stats['one_off_total'])} <span class="breakdown-pct">({stats['one_off_total'] * pct_of_actual:.1f}%)</span></span>
                     </div>
                 </div>
             </div>
@@ -2109,7 +2296,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                 <div class="breakdown">
                     <div class="breakdown-item">
                         <span class="name">Uncategorized</span>
-                        <span class="value">{fmt(uncat)} ({uncat/actual*100:.1f}%)</span>
+                        <span class="value">{fmt(uncat)} ({uncat * pct_of_actual:.1f}%)</span>
                     </div>
                 </div>
             </div>
@@ -2147,7 +2334,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="monthly-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Expenses appearing 6+ months with consistent amounts">Monthly Recurring</span></h2>
-                <span class="section-total"><span class="section-monthly">{fmt(stats['monthly_avg'])}/mo</span> · <span class="section-ytd">{fmt(stats['monthly_total'])}</span> <span class="section-pct">({stats['monthly_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total"><span class="section-monthly">{fmt(stats['monthly_avg'])}/mo</span> · <span class="section-ytd">{fmt(stats['monthly_total'])}</span> <span class="section-pct">({stats['monthly_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2163,7 +2350,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('monthly-table', 6, 'number')" data-tooltip="Percentage of section total">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # Monthly recurring rows
     sorted_monthly = sorted(monthly_merchants.items(),
@@ -2181,7 +2368,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         merchant_id = make_merchant_id(merchant)
         cat_data = f"{data.get('category', '')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', ''))
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td>{data['months_active']}</td>
@@ -2190,16 +2377,16 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <td class="money">{fmt(monthly)}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows (hidden by default)
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="7"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2218,7 +2405,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="annual-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Once-a-year expenses like insurance or annual subscriptions">Annual Bills</span></h2>
-                <span class="section-total">{fmt(stats['annual_total'])} <span class="section-pct">({stats['annual_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total">{fmt(stats['annual_total'])} <span class="section-pct">({stats['annual_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2232,7 +2419,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('annual-table', 4, 'number')">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # Annual bills rows
     sorted_annual = sorted(annual_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
@@ -2243,23 +2430,23 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         cat_data = f"{data.get('category', '')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', ''))
         subcategory_id = make_category_id(data.get('subcategory', ''))
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td class="category clickable" data-category-id="{subcategory_id}" onclick="addFilterFromCell(event, this, 'category')">{data['subcategory']}</td>
                         <td>{data['count']}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="5"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2276,7 +2463,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="periodic-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Regular but not monthly expenses (quarterly, bi-annual)">Periodic Recurring</span></h2>
-                <span class="section-total">{fmt(stats['periodic_total'])} <span class="section-pct">({stats['periodic_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total">{fmt(stats['periodic_total'])} <span class="section-pct">({stats['periodic_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2290,7 +2477,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('periodic-table', 4, 'number')">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # Periodic bills rows
     sorted_periodic = sorted(periodic_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
@@ -2301,23 +2488,23 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         cat_data = f"{data.get('category', '')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', ''))
         subcategory_id = make_category_id(data.get('subcategory', ''))
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td class="category clickable" data-category-id="{subcategory_id}" onclick="addFilterFromCell(event, this, 'category')">{data['subcategory']}</td>
                         <td>{data['count']}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="5"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2334,7 +2521,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="travel-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Spending outside your home location(s)">Travel / Trips</span></h2>
-                <span class="section-total">{fmt(stats['travel_total'])} <span class="section-pct">({stats['travel_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total">{fmt(stats['travel_total'])} <span class="section-pct">({stats['travel_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2348,7 +2535,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('travel-table', 4, 'number')">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # Travel rows
     sorted_travel = sorted(travel_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
@@ -2359,23 +2546,23 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         cat_data = f"{data.get('category', 'travel')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', 'travel'))
         category_display = data.get('category', 'Travel')
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td class="clickable" data-category-id="{category_id}" onclick="addFilterFromCell(event, this, 'category')">{category_display}</td>
                         <td>{data['count']}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="5"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2392,7 +2579,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="oneoff-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Single large purchases that don't recur">One-Off Purchases</span></h2>
-                <span class="section-total">{fmt(stats['one_off_total'])} <span class="section-pct">({stats['one_off_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total">{fmt(stats['one_off_total'])} <span class="section-pct">({stats['one_off_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2406,7 +2593,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('oneoff-table', 4, 'number')">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # One-off rows
     sorted_oneoff = sorted(one_off_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
@@ -2416,23 +2603,23 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         merchant_id = make_merchant_id(merchant)
         cat_data = f"{data.get('category', '')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', ''))
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td class="category clickable" data-category-id="{category_id}" onclick="addFilterFromCell(event, this, 'category')">{data['category']}</td>
                         <td>{data['count']}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="5"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2449,7 +2636,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         <section class="variable-section">
             <div class="section-header" onclick="toggleSection(this)">
                 <h2><span class="toggle">▼</span> <span data-tooltip="Day-to-day spending. Monthly total = sum of Avg/Mo values.">Variable / Discretionary</span></h2>
-                <span class="section-total"><span class="section-monthly">{fmt(stats['variable_monthly'])}/mo</span> · <span class="section-ytd">{fmt(stats['variable_total'])}</span> <span class="section-pct">({stats['variable_total']/actual*100:.1f}%)</span></span>
+                <span class="section-total"><span class="section-monthly">{fmt(stats['variable_monthly'])}/mo</span> · <span class="section-ytd">{fmt(stats['variable_total'])}</span> <span class="section-pct">({stats['variable_total'] * pct_of_actual:.1f}%)</span></span>
             </div>
             <div class="section-content">
             <div class="table-wrapper">
@@ -2465,7 +2652,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <th onclick="sortTable('variable-table', 6, 'number')" data-tooltip="Percentage of section total">%</th>
                     </tr>
                 </thead>
-                <tbody>'''
+                <tbody>''')
 
     # Variable rows - show individual merchants
     sorted_var = sorted(variable_merchants.items(), key=lambda x: x[1]['total'], reverse=True)
@@ -2478,7 +2665,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
         cat_data = f"{data.get('category', '')}/{data.get('subcategory', '')}".lower()
         category_id = make_category_id(data.get('category', ''))
         subcategory_id = make_category_id(data.get('subcategory', ''))
-        html += f'''
+        out(f'''
                     <tr class="merchant-row" data-merchant="{merchant_id}" data-category="{cat_data}" data-category-id="{category_id}" data-ytd="{data['total']:.2f}" onclick="toggleTransactions(this)">
                         <td class="merchant"><span class="chevron clickable" onclick="toggleTransactionsFromChevron(event, this)">▶</span> <span class="clickable" onclick="addFilterFromCell(event, this, 'merchant')">{merchant}</span></td>
                         <td class="category"><span class="clickable" data-category-id="{category_id}" onclick="addFilterFromCell(event, this, 'category')">{data['category']}</span>/<span class="clickable" data-category-id="{subcategory_id}" onclick="addFilterFromCell(event, this, 'category')">{data['subcategory']}</span></td>
@@ -2487,16 +2674,16 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
                         <td class="money">{fmt(avg)}</td>
                         <td class="money">{fmt(data['total'])}</td>
                         <td class="pct">{pct:.1f}%</td>
-                    </tr>'''
+                    </tr>''')
         # Add transaction detail rows
-        sorted_txns = sorted(data.get('transactions', []), key=lambda x: x['date'], reverse=True)
+        sorted_txns = sorted(data.get('transactions', ()), key=by_date, reverse=True)
         for txn in sorted_txns:
-            html += f'''
+            out(f'''
                     <tr class="txn-row hidden" data-merchant="{merchant_id}" data-amount="{txn['amount']:.2f}" data-month="{txn['month']}" data-category="{cat_data}" data-category-id="{category_id}">
                         <td colspan="7"><div class="txn-detail"><span class="txn-date">{txn['date']}</span><span class="txn-desc">{txn['description']}</span><span class="txn-amount">{fmt_dec(txn['amount'])}</span><span class="txn-source {txn['source'].lower()}">{txn['source']}</span>{location_badge(txn.get('location'))}</div></td>
-                    </tr>'''
+                    </tr>''')
 
-    html += f'''
+    out(f'''
                     <tr class="total-row">
                         <td>Total</td>
                         <td></td>
@@ -2824,7 +3011,7 @@ def write_summary_file(stats, filepath, year=2025, home_locations=None, currency
 {embedded_json}
     </script>
 </body>
-</html>'''
+</html>''')
 
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html)
+        f.writelines(parts)
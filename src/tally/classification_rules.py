@@ -6,6 +6,7 @@ Evaluates them against merchant statistics to determine bucket and calc_type.
 """
 
 import re
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
@@ -140,6 +141,7 @@ MODIFIER = re.compile(r'\[(\w+)(>=|<=|>|<|=)(\d+\.?\d*)(%?)\]')
 VALID_BUCKETS = {'excluded', 'travel', 'annual', 'periodic', 'monthly', 'one_off', 'variable'}
 VALID_CALC_TYPES = {'avg', '/12', 'auto'}
 VALID_VARIABLES = {'months', 'count', 'total', 'cv', 'max', 'avg', 'max_avg_ratio'}
+VALID_FIELDS = {'category', 'subcategory'}
 
 
 def parse_rule(line: str, line_number: int) -> Optional[ClassificationRule]:
@@ -196,9 +198,10 @@ def parse_rule(line: str, line_number: int) -> Optional[ClassificationRule]:
     field_matches = []
     for field_match in FIELD_MATCH.finditer(field_part):
         field_name, field_value = field_match.groups()
-        if field_name not in ('category', 'subcategory'):
+        if field_name not in VALID_FIELDS:
             raise RuleParseError(f"Line {line_number}: Invalid field '{field_name}'. Must be 'category' or 'subcategory'")
-        field_matches.append(FieldMatch(field=field_name, value=field_value))
+        # Interned like the parsed transaction categories, so matching is mostly identity checks
+        field_matches.append(FieldMatch(field=field_name, value=sys.intern(field_value)))
 
     return ClassificationRule(
         line_number=line_number,
@@ -308,6 +311,26 @@ def matches_rule(rule: ClassificationRule, stats: Dict[str, Any], num_months: in
     return True
 
 
+def rules_for_fields(
+    rules: List[ClassificationRule],
+    category: str,
+    subcategory: str
+) -> List[ClassificationRule]:
+    """Return the rules whose field matches accept this category/subcategory, in order.
+
+    Classifying with this subset gives the same result as with all rules, so
+    merchants sharing a category/subcategory can share one filtered list. Field
+    checks mirror matches_rule: default rules are always kept and fields other
+    than category/subcategory don't filter.
+    """
+    fields = {'category': category, 'subcategory': subcategory}
+    return [
+        rule for rule in rules
+        if rule.is_default
+        or all(fields.get(fm.field, fm.value) == fm.value for fm in rule.field_matches)
+    ]
+
+
 def resolve_calc_type(calc_type: str, cv: float) -> str:
     """Resolve 'auto' calc_type based on CV."""
     if calc_type == 'auto':
@@ -12,6 +12,7 @@ import argparse
 import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Terminal color support
 def _supports_color():
@@ -528,6 +529,50 @@ STARTER_VIEWS = '''# Tally Views Configuration (.rules format)
 
 _deprecated_parser_warnings = []  # Collect warnings to print at end
 
+# Below this much input, worker startup costs more than parsing files in parallel saves
+PARALLEL_PARSE_MIN_BYTES = 2 * 1024 * 1024
+
+
+def _parse_source(parser_type, filepath, rules, home_locations, cleaning_patterns,
+                  format_spec=None, source_name='CSV', decimal_separator='.'):
+    """Parse one data source file (module-level so worker processes can run it)."""
+    if parser_type == 'amex':
+        return parse_amex(filepath, rules, home_locations, cleaning_patterns)
+    if parser_type == 'boa':
+        return parse_boa(filepath, rules, home_locations, cleaning_patterns)
+    return parse_generic_csv(filepath, format_spec, rules,
+                             home_locations,
+                             source_name=source_name,
+                             decimal_separator=decimal_separator,
+                             cleaning_patterns=cleaning_patterns)
+
+
+def _parse_sources(jobs):
+    """Parse (parser_type, filepath, ...) jobs, in parallel processes when worthwhile.
+
+    Returns one result per job, in order: the transaction list, or the exception
+    raised while parsing that file.
+    """
+    def run(job):
+        try:
+            return _parse_source(*job)
+        except Exception as e:
+            return e
+
+    total_bytes = sum(os.path.getsize(job[1]) for job in jobs)
+    if len(jobs) < 2 or total_bytes < PARALLEL_PARSE_MIN_BYTES:
+        return [run(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_parse_source, *job) for job in jobs]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
 def _warn_deprecated_parser(source_name, parser_type, filepath):
     """Record deprecation warning for amex/boa parsers (to print at end)."""
     warning = (source_name, parser_type, filepath)
@@ -957,8 +1002,11 @@ def cmd_run(args):
     # Load merchant rules (with migration check for CSV -> .rules)
     rules = _check_merchant_migration(config, config_dir, args.quiet, getattr(args, 'migrate', False))
 
-    # Parse transactions from configured data sources
+    # Parse transactions from configured data sources. Sources are resolved in
+    # order, the files parsed (in parallel when large), then reported in order.
     all_txns = []
+    resolved = []  # (source, outcome): an error message if skipped, else its index in jobs
+    jobs = []
 
     for source in data_sources:
         filepath = os.path.join(config_dir, '..', source['file'])
@@ -969,35 +1017,42 @@ def cmd_run(args):
             filepath = os.path.join(os.path.dirname(config_dir), source['file'])
 
         if not os.path.exists(filepath):
-            if not args.quiet:
-                print(f"  {source['name']}: File not found - {source['file']}")
+            resolved.append((source, f"  {source['name']}: File not found - {source['file']}"))
             continue
 
         # Get parser type and format spec (set by config_loader.resolve_source_format)
         parser_type = source.get('_parser_type', source.get('type', '')).lower()
         format_spec = source.get('_format_spec')
 
-        try:
-            if parser_type == 'amex':
-                _warn_deprecated_parser(source.get('name', 'AMEX'), 'amex', source['file'])
-                txns = parse_amex(filepath, rules, home_locations, cleaning_patterns)
-            elif parser_type == 'boa':
-                _warn_deprecated_parser(source.get('name', 'BOA'), 'boa', source['file'])
-                txns = parse_boa(filepath, rules, home_locations, cleaning_patterns)
-            elif parser_type == 'generic' and format_spec:
-                txns = parse_generic_csv(filepath, format_spec, rules,
-                                         home_locations,
-                                         source_name=source.get('name', 'CSV'),
-                                         decimal_separator=source.get('decimal_separator', '.'),
-                                         cleaning_patterns=cleaning_patterns)
-            else:
-                if not args.quiet:
-                    print(f"  {source['name']}: Unknown parser type '{parser_type}'")
-                    print(f"    Use 'tally inspect {source['file']}' to determine format")
-                continue
-        except Exception as e:
+        if parser_type == 'amex':
+            _warn_deprecated_parser(source.get('name', 'AMEX'), 'amex', source['file'])
+            job = (parser_type, filepath, rules, home_locations, cleaning_patterns)
+        elif parser_type == 'boa':
+            _warn_deprecated_parser(source.get('name', 'BOA'), 'boa', source['file'])
+            job = (parser_type, filepath, rules, home_locations, cleaning_patterns)
+        elif parser_type == 'generic' and format_spec:
+            job = (parser_type, filepath, rules, home_locations, cleaning_patterns, format_spec,
+                   source.get('name', 'CSV'), source.get('decimal_separator', '.'))
+        else:
+            resolved.append((source,
+                             f"  {source['name']}: Unknown parser type '{parser_type}'\n"
+                             f"    Use 'tally inspect {source['file']}' to determine format"))
+            continue
+        resolved.append((source, len(jobs)))
+        jobs.append(job)
+
+    results = _parse_sources(jobs)
+
+    for source, outcome in resolved:
+        if isinstance(outcome, str):
             if not args.quiet:
-                print(f"  {source['name']}: Error parsing - {e}")
+                print(outcome)
+            continue
+
+        txns = results[outcome]
+        if isinstance(txns, Exception):
+            if not args.quiet:
+                print(f"  {source['name']}: Error parsing - {txns}")
             continue
 
         all_txns.extend(txns)
@@ -2790,33 +2845,16 @@ def _get_matching_views(data, views_config, num_months):
     subcategory = data.get('subcategory', '')
     tags = list(data.get('tags', []))
 
-    # Use actual transactions if available, otherwise build synthetic ones
-    existing_txns = data.get('transactions', [])
-    if existing_txns:
-        # Use real transactions - they already have proper month info
-        transactions = []
-        for txn in existing_txns:
-            transactions.append({
-                'amount': txn['amount'],
-                'date': datetime.strptime(txn['month'] + '-15', '%Y-%m-%d'),
-                'category': category,
-                'subcategory': subcategory,
-                'tags': tags,
-            })
-    else:
-        # Build synthetic transactions with dates spread across months_active
-        payments = data.get('payments', [])
-        transactions = []
-        for i, p in enumerate(payments):
-            # Spread across different months so get_months() works
-            month_offset = i % max(1, months_active)
-            transactions.append({
-                'amount': p,
-                'date': datetime(2025, max(1, min(12, month_offset + 1)), 15),
-                'category': category,
-                'subcategory': subcategory,
-                'tags': tags,
-            })
+    # Evaluate against the merchant's real transactions - they already have proper month info
+    transactions = []
+    for txn in data.get('transactions', []):
+        transactions.append({
+            'amount': txn['amount'],
+            'date': datetime.strptime(txn['month'] + '-15', '%Y-%m-%d'),
+            'category': category,
+            'subcategory': subcategory,
+            'tags': tags,
+        })
 
     # Evaluate global variables
     global_vars = evaluate_variables(
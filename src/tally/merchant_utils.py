@@ -9,6 +9,7 @@ import csv
 import os
 import re
 from datetime import date
+from itertools import islice
 from typing import Optional, List, Tuple
 
 from .modifier_parser import (
@@ -18,6 +19,14 @@ from .modifier_parser import (
     ModifierParseError,
 )
 
+WHITESPACE_PATTERN = re.compile(r'\s+')
+NON_ALPHA_PATTERN = re.compile(r'[^A-Za-z\s]')
+# Numbered/named backreferences and group conditionals, which change meaning
+# once a pattern is embedded in a larger regex
+BACKREFERENCE_PATTERN = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+# Flags every rule is compiled with; any other flag came from an inline global
+# flag such as (?x), which would apply to the whole combined regex
+COMBINABLE_FLAGS = re.IGNORECASE | re.UNICODE
 
 
 def load_merchant_rules(csv_path):
@@ -282,21 +291,31 @@ def clean_description(description, cleaning_patterns=None):
     Returns:
         Cleaned description with patterns removed and whitespace normalized.
     """
+    return _apply_cleaning(description, _compile_cleaning_patterns(cleaning_patterns))
+
+
+def _compile_cleaning_patterns(cleaning_patterns):
+    """Compile cleaning patterns (case-insensitive), skipping invalid regexes."""
+    compiled = []
+    for pattern in cleaning_patterns or ():
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error:
+            # Invalid regex, skip
+            continue
+    return compiled
+
+
+def _apply_cleaning(description, compiled_patterns):
+    """Strip compiled cleaning patterns from a description and normalize whitespace."""
     cleaned = description
 
     # Apply user-configured cleaning patterns
-    if cleaning_patterns:
-        for pattern in cleaning_patterns:
-            try:
-                cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-            except re.error:
-                # Invalid regex, skip
-                continue
+    for pattern in compiled_patterns:
+        cleaned = pattern.sub('', cleaned)
 
     # Normalize whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-
-    return cleaned
+    return WHITESPACE_PATTERN.sub(' ', cleaned).strip()
 
 
 def extract_merchant_name(description, cleaning_patterns=None):
@@ -304,16 +323,123 @@ def extract_merchant_name(description, cleaning_patterns=None):
 
     Used as fallback when no pattern matches.
     """
-    cleaned = clean_description(description, cleaning_patterns)
+    return _merchant_name_from_cleaned(clean_description(description, cleaning_patterns))
+
 
+def _merchant_name_from_cleaned(cleaned):
     # Remove non-alphabetic characters for grouping, keep first 2-3 words
-    words = re.sub(r'[^A-Za-z\s]', ' ', cleaned).split()[:3]
+    words = NON_ALPHA_PATTERN.sub(' ', cleaned).split()[:3]
 
     if words:
         return ' '.join(words).title()
     return 'Unknown'
 
 
+def compile_rules(rules):
+    """Prepare merchant rules for matching many descriptions.
+
+    Unpacks each rule tuple and compiles its regex once, so batch normalization
+    doesn't redo either per transaction. Rules with invalid regexes are dropped
+    (normalize_merchant skips them as well).
+
+    Args:
+        rules: List of rule tuples as accepted by normalize_merchant
+
+    Returns:
+        List of (regex, merchant, category, subcategory, parsed, match_info) tuples.
+        parsed is None unless the rule has amount/date modifiers.
+    """
+    compiled = []
+    for rule in rules:
+        # Handle various formats: 4-tuple, 5-tuple, 6-tuple, 7-tuple (with tags)
+        tags = []
+        if len(rule) == 7:
+            pattern, merchant, category, subcategory, parsed, source, tags = rule
+        elif len(rule) == 6:
+            pattern, merchant, category, subcategory, parsed, source = rule
+        elif len(rule) == 5:
+            pattern, merchant, category, subcategory, parsed = rule
+            source = 'unknown'
+        else:
+            pattern, merchant, category, subcategory = rule
+            parsed = None
+            source = 'unknown'
+
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            # Invalid regex pattern, skip
+            continue
+
+        if not (parsed and (parsed.amount_conditions or parsed.date_conditions)):
+            parsed = None
+
+        compiled.append((regex, merchant, category, subcategory, parsed,
+                         {'pattern': pattern, 'source': source, 'tags': tags}))
+    return compiled
+
+
+def combine_rules(compiled_rules):
+    """Combine compiled rules into one regex that finds the first matching rule.
+
+    Each rule's pattern becomes a lookahead anchored at the start of the text,
+    followed by an empty marker group. Alternatives are tried in rule order, so
+    a match means the lowest-numbered rule that matches anywhere, and its marker
+    (``match.lastgroup``) names it. A whole rule list is tested with one search
+    instead of one Python-level search per rule.
+
+    Args:
+        compiled_rules: Output of compile_rules
+
+    Returns:
+        Compiled regex with markers named ``_rule<index>``, or None if the
+        patterns can't be combined safely (backreferences, inline global
+        flags, clashing group names). Callers then test rules one by one.
+    """
+    parts = []
+    for index, rule in enumerate(compiled_rules):
+        regex = rule[0]
+        if regex.flags & ~COMBINABLE_FLAGS:
+            return None
+        pattern = regex.pattern
+        if BACKREFERENCE_PATTERN.search(pattern):
+            return None
+        parts.append(f'(?=[\\s\\S]*?(?:{pattern}))(?P<_rule{index}>)')
+    if not parts:
+        return None
+    try:
+        return re.compile('^(?:' + '|'.join(parts) + ')', re.IGNORECASE)
+    except re.error:
+        return None
+
+
+# Most recently prepared rule list: (snapshot of the rules, compiled, combined)
+_prepared_rules = [None]
+
+
+def _prepare_rules(rules):
+    """Compile and combine rules, reusing the last result for the same rules.
+
+    normalize_merchant is often called once per row with the same rule list, so
+    recompiling every time would cost more than the matching itself. The cache
+    is keyed on the list's contents, so a list changed in place is recompiled.
+    """
+    snapshot = tuple(rules)
+    cached = _prepared_rules[0]
+    if cached is not None and cached[0] == snapshot:
+        return cached[1], cached[2]
+    compiled_rules = compile_rules(snapshot)
+    combined = combine_rules(compiled_rules)
+    _prepared_rules[0] = (snapshot, compiled_rules, combined)
+    return compiled_rules, combined
+
+
+def _first_rule_index(combined, text):
+    """Index of the first rule matching text, or None."""
+    match = combined.match(text)
+    return int(match.lastgroup[5:]) if match else None
+
+
 def normalize_merchant(
     description: str,
     rules: list,
@@ -335,49 +461,83 @@ def normalize_merchant(
         Tuple of (merchant_name, category, subcategory, match_info)
         match_info is a dict with 'pattern', 'source', 'tags', or None if no match
     """
-    # Clean the description for better matching
-    cleaned = clean_description(description, cleaning_patterns)
-    desc_upper = description.upper()
-    cleaned_upper = cleaned.upper()
+    return normalize_merchants([description], rules, [amount], [txn_date], cleaning_patterns)[0]
 
-    # Try pattern matching against both original and cleaned
-    for rule in rules:
-        # Handle various formats: 4-tuple, 5-tuple, 6-tuple, 7-tuple (with tags)
-        tags = []
-        if len(rule) == 7:
-            pattern, merchant, category, subcategory, parsed, source, tags = rule
-        elif len(rule) == 6:
-            pattern, merchant, category, subcategory, parsed, source = rule
-        elif len(rule) == 5:
-            pattern, merchant, category, subcategory, parsed = rule
-            source = 'unknown'
-        else:
-            pattern, merchant, category, subcategory = rule
-            parsed = None
-            source = 'unknown'
 
-        try:
-            # Check regex pattern first (most common case)
-            regex_matches = (
-                re.search(pattern, desc_upper, re.IGNORECASE) or
-                re.search(pattern, cleaned_upper, re.IGNORECASE)
-            )
-            if not regex_matches:
+def normalize_merchants(
+    descriptions: List[str],
+    rules: list,
+    amounts: Optional[List[Optional[float]]] = None,
+    dates: Optional[List[Optional[date]]] = None,
+    cleaning_patterns: Optional[List[str]] = None
+) -> List[Tuple[str, str, str, Optional[dict]]]:
+    """Normalize many descriptions against the same rules.
+
+    Same results as calling normalize_merchant per description, but the rules
+    and cleaning patterns are compiled once for the whole batch.
+
+    Args:
+        descriptions: Raw transaction descriptions
+        rules: Rule tuples as accepted by normalize_merchant
+        amounts: Optional amounts, parallel to descriptions
+        dates: Optional transaction dates, parallel to descriptions
+        cleaning_patterns: Optional list of regex patterns to strip from descriptions
+
+    Returns:
+        List of (merchant_name, category, subcategory, match_info) tuples, one per description
+    """
+    compiled_rules, combined = _prepare_rules(rules)
+    compiled_cleaning = _compile_cleaning_patterns(cleaning_patterns)
+    if amounts is None:
+        amounts = [None] * len(descriptions)
+    if dates is None:
+        dates = [None] * len(descriptions)
+
+    # Recurring transactions repeat descriptions, so the text-only work
+    # (cleaning, uppercasing, finding the first candidate rule) is done once
+    # per distinct description; only modifier checks depend on amount/date.
+    prepared = {}
+
+    results = []
+    for description, amount, txn_date in zip(descriptions, amounts, dates):
+        entry = prepared.get(description)
+        if entry is None:
+            # Clean the description for better matching
+            cleaned = _apply_cleaning(description, compiled_cleaning)
+            desc_upper = description.upper()
+            cleaned_upper = cleaned.upper()
+            # Often cleaning changes nothing; then a miss on the original is a miss on both
+            cleaned_differs = cleaned_upper != desc_upper
+
+            # Jump straight to the first rule matching either text; rules before it
+            # can't match. If none match, fall through to the Unknown fallback.
+            start = 0
+            if combined is not None:
+                hits = [_first_rule_index(combined, desc_upper)]
+                if cleaned_differs:
+                    hits.append(_first_rule_index(combined, cleaned_upper))
+                hits = [hit for hit in hits if hit is not None]
+                start = min(hits) if hits else len(compiled_rules)
+
+            entry = prepared[description] = (cleaned, desc_upper, cleaned_upper, cleaned_differs, start)
+        cleaned, desc_upper, cleaned_upper, cleaned_differs, start = entry
+
+        # Try pattern matching against both original and cleaned
+        for regex, merchant, category, subcategory, parsed, match_info in islice(compiled_rules, start, None):
+            if not (regex.search(desc_upper) or (cleaned_differs and regex.search(cleaned_upper))):
                 continue
 
             # If pattern has modifiers, check them
-            if parsed and (parsed.amount_conditions or parsed.date_conditions):
-                if not check_all_conditions(parsed, amount, txn_date):
-                    continue
+            if parsed and not check_all_conditions(parsed, amount, txn_date):
+                continue
 
-            return (merchant, category, subcategory, {'pattern': pattern, 'source': source, 'tags': tags})
-        except re.error:
-            # Invalid regex pattern, skip
-            continue
+            results.append((merchant, category, subcategory, dict(match_info)))
+            break
+        else:
+            # Fallback: extract merchant name from description, categorize as Unknown
+            results.append((_merchant_name_from_cleaned(cleaned), 'Unknown', 'Unknown', None))
 
-    # Fallback: extract merchant name from description, categorize as Unknown
-    merchant_name = extract_merchant_name(description, cleaning_patterns)
-    return (merchant_name, 'Unknown', 'Unknown', None)
+    return results
 
 
 def explain_description(
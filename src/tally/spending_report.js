@@ -10,6 +10,13 @@ const CATEGORY_COLORS = [
     '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4'
 ];
 
+// Formatters hoisted out of the per-row template helpers: toLocaleString()
+// builds a fresh Intl formatter on every call, once per rendered row.
+const MONTH_NAMES = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
+const SHORT_DATE_RE = /^\d{1,2}\/\d{1,2}$/;
+const AMOUNT_FORMAT = new Intl.NumberFormat('en-US');
+const DATE_FORMAT = new Intl.DateTimeFormat('en-US', { month: 'short', day: 'numeric' });
+
 createApp({
     setup() {
         // ========== STATE ==========
@@ -17,6 +24,7 @@ createApp({
         const expandedMerchants = reactive(new Set());
         const collapsedSections = reactive(new Set());
         const searchQuery = ref('');
+        const autocompleteQuery = ref(''); // searchQuery as applied to the list, at most once per frame
         const showAutocomplete = ref(false);
         const autocompleteIndex = ref(-1);
         const isScrolled = ref(false);
@@ -49,50 +57,65 @@ createApp({
             return sources.length > 0 ? `Data from ${sources.join(', ')}` : '';
         });
 
-        // Core filtering - returns sections with filtered merchants and transactions
-        const filteredSections = computed(() => {
+        // Results of filter passes keyed by the active-filter signature. Report data
+        // never changes after load, so entries stay valid and toggling a filter off
+        // and back on reuses the earlier pass instead of walking every transaction.
+        const FILTER_CACHE_SIZE = 64;
+        const filterCache = new Map();
+        const filterSignature = computed(() =>
+            JSON.stringify(activeFilters.value.map(f => [f.type, f.mode, f.text]))
+        );
+
+        function memoize(cache, key, compute) {
+            if (cache.has(key)) return cache.get(key);
+            const value = compute();
+            if (cache.size >= FILTER_CACHE_SIZE) {
+                // Evict the oldest entry (Map preserves insertion order)
+                cache.delete(cache.keys().next().value);
+            }
+            cache.set(key, value);
+            return value;
+        }
+
+        function cachedForFilters(name, compute) {
+            return memoize(filterCache, `${name}|${filterSignature.value}`, compute);
+        }
+
+        // Core filtering - returns sections with filtered merchants and transactions,
+        // totalling each section in the same pass
+        const filteredSections = computed(() => cachedForFilters('sections', () => {
             const result = {};
             const data = spendingData.value;
 
             for (const [sectionId, section] of Object.entries(data.sections || {})) {
                 const filteredMerchants = {};
+                let sectionTotal = 0;
 
                 for (const [merchantId, merchant] of Object.entries(section.merchants || {})) {
-                    // Filter transactions
-                    const filteredTxns = merchant.transactions.filter(txn =>
-                        passesFilters(txn, merchant)
-                    );
-
-                    if (filteredTxns.length > 0) {
-                        const filteredTotal = filteredTxns.reduce((sum, t) => sum + t.amount, 0);
-                        const months = new Set(filteredTxns.map(t => t.month));
-
-                        filteredMerchants[merchantId] = {
-                            ...merchant,
-                            filteredTxns,
-                            filteredTotal,
-                            filteredCount: filteredTxns.length,
-                            filteredMonths: months.size
-                        };
+                    const filtered = filterMerchant(merchant);
+                    if (filtered) {
+                        filteredMerchants[merchantId] = filtered;
+                        sectionTotal += filtered.filteredTotal;
                     }
                 }
 
                 if (Object.keys(filteredMerchants).length > 0) {
                     result[sectionId] = {
                         ...section,
-                        filteredMerchants
+                        filteredMerchants,
+                        filteredTotal: sectionTotal
                     };
                 }
             }
 
             return result;
-        });
+        }));
 
         // Only sections with visible merchants
         const visibleSections = computed(() => filteredSections.value);
 
         // Category view with filtering applied
-        const filteredCategoryView = computed(() => {
+        const filteredCategoryView = computed(() => cachedForFilters('categoryView', () => {
             const categoryView = spendingData.value.categoryView || {};
             const result = {};
 
@@ -105,23 +128,10 @@ createApp({
                     let subcatTotal = 0;
 
                     for (const [merchantId, merchant] of Object.entries(subcat.merchants || {})) {
-                        // Filter transactions
-                        const filteredTxns = (merchant.transactions || []).filter(txn =>
-                            passesFilters(txn, merchant)
-                        );
-
-                        if (filteredTxns.length > 0) {
-                            const filteredTotal = filteredTxns.reduce((sum, t) => sum + t.amount, 0);
-                            const months = new Set(filteredTxns.map(t => t.month));
-
-                            filteredMerchants[merchantId] = {
-                                ...merchant,
-                                filteredTxns,
-                                filteredTotal,
-                                filteredCount: filteredTxns.length,
-                                filteredMonths: months.size
-                            };
-                            subcatTotal += filteredTotal;
+                        const filtered = filterMerchant(merchant);
+                        if (filtered) {
+                            filteredMerchants[merchantId] = filtered;
+                            subcatTotal += filtered.filteredTotal;
                         }
                     }
 
@@ -148,7 +158,7 @@ createApp({
             return Object.fromEntries(
                 Object.entries(result).sort((a, b) => b[1].filteredTotal - a[1].filteredTotal)
             );
-        });
+        }));
 
         // Check if sections are defined
         const hasSections = computed(() => {
@@ -156,64 +166,24 @@ createApp({
             return Object.keys(sections).length > 0;
         });
 
-        // View mode with filtering applied (for By View tab)
-        const filteredSectionView = computed(() => {
-            const sections = spendingData.value.sections || {};
-            const result = {};
-
-            for (const [sectionId, section] of Object.entries(sections)) {
-                const filteredMerchants = {};
-                let sectionTotal = 0;
-
-                for (const [merchantId, merchant] of Object.entries(section.merchants || {})) {
-                    // Filter transactions
-                    const filteredTxns = (merchant.transactions || []).filter(txn =>
-                        passesFilters(txn, merchant)
-                    );
-
-                    if (filteredTxns.length > 0) {
-                        const filteredTotal = filteredTxns.reduce((sum, t) => sum + t.amount, 0);
-                        const months = new Set(filteredTxns.map(t => t.month));
-
-                        filteredMerchants[merchantId] = {
-                            ...merchant,
-                            filteredTxns,
-                            filteredTotal,
-                            filteredCount: filteredTxns.length,
-                            filteredMonths: months.size
-                        };
-                        sectionTotal += filteredTotal;
-                    }
-                }
-
-                if (Object.keys(filteredMerchants).length > 0) {
-                    result[sectionId] = {
-                        ...section,
-                        filteredMerchants,
-                        filteredTotal: sectionTotal
-                    };
-                }
-            }
-
-            return result;
-        });
+        // View mode with filtering applied (for By View tab) - same shape as filteredSections
+        const filteredSectionView = computed(() => filteredSections.value);
 
-        // Totals per section
-        const sectionTotals = computed(() => {
+        // Totals per section, as accumulated by the filter pass
+        const sectionTotals = computed(() => cachedForFilters('sectionTotals', () => {
             const totals = {};
             for (const [sectionId, section] of Object.entries(filteredSections.value)) {
-                totals[sectionId] = Object.values(section.filteredMerchants)
-                    .reduce((sum, m) => sum + m.filteredTotal, 0);
+                totals[sectionId] = section.filteredTotal;
             }
             return totals;
-        });
+        }));
 
         // Grand total (from category view to avoid double-counting across sections)
-        const grandTotal = computed(() => {
+        const grandTotal = computed(() => cachedForFilters('grandTotal', () => {
             // Sum totals from category view (unique merchants only)
             return Object.values(filteredCategoryView.value)
                 .reduce((sum, cat) => sum + (cat.filteredTotal || 0), 0);
-        });
+        }));
 
         // Uncategorized total
         const uncategorizedTotal = computed(() => {
@@ -320,7 +290,7 @@ createApp({
         });
 
         // Chart data aggregations
-        const chartAggregations = computed(() => {
+        const chartAggregations = computed(() => cachedForFilters('chartAggregations', () => {
             const byMonth = {};
             const byCategory = {};
             const byCategoryByMonth = {};
@@ -344,7 +314,7 @@ createApp({
             }
 
             return { byMonth, byCategory, byCategoryByMonth };
-        });
+        }));
 
         // Filtered months for charts (respects month filters)
         const filteredMonthsForCharts = computed(() => {
@@ -441,6 +411,9 @@ createApp({
                 type: 'tag', filterText: t, displayText: t, id: `t:${t}`
             }));
 
+            // Lowercased once here so typing doesn't re-lowercase every item per keystroke
+            for (const item of items) item.searchText = item.displayText.toLowerCase();
+
             return items;
         });
 
@@ -460,12 +433,57 @@ createApp({
         }
 
         // Filtered autocomplete based on search
+        // N-gram postings over searchText (grams of 1..AUTOCOMPLETE_GRAM chars -> item
+        // indices, ascending). A query no longer than the gram size is answered by its
+        // own posting list; longer queries only verify items on their rarest gram's list.
+        const AUTOCOMPLETE_GRAM = 3;
+        const autocompleteGrams = computed(() => {
+            const grams = new Map();
+            autocompleteItems.value.forEach((item, i) => {
+                const text = item.searchText;
+                const seen = new Set();
+                for (let len = 1; len <= AUTOCOMPLETE_GRAM; len++) {
+                    for (let j = 0; j + len <= text.length; j++) {
+                        const gram = text.slice(j, j + len);
+                        if (seen.has(gram)) continue;
+                        seen.add(gram);
+                        let list = grams.get(gram);
+                        if (!list) {
+                            list = [];
+                            grams.set(gram, list);
+                        }
+                        list.push(i);
+                    }
+                }
+            });
+            return grams;
+        });
+
         const filteredAutocomplete = computed(() => {
-            const q = searchQuery.value.toLowerCase().trim();
+            const q = autocompleteQuery.value.toLowerCase().trim();
             if (!q) return [];
-            return autocompleteItems.value
-                .filter(item => item.displayText.toLowerCase().includes(q))
-                .slice(0, 10);
+            const items = autocompleteItems.value;
+            const grams = autocompleteGrams.value;
+
+            let candidates;
+            if (q.length <= AUTOCOMPLETE_GRAM) {
+                candidates = grams.get(q) || [];
+            } else {
+                for (let j = 0; j + AUTOCOMPLETE_GRAM <= q.length; j++) {
+                    const list = grams.get(q.slice(j, j + AUTOCOMPLETE_GRAM));
+                    if (!list) return [];
+                    if (!candidates || list.length < candidates.length) candidates = list;
+                }
+            }
+
+            const results = [];
+            for (const i of candidates) {
+                if (items[i].searchText.includes(q)) {
+                    results.push(items[i]);
+                    if (results.length === 10) break;
+                }
+            }
+            return results;
         });
 
         // Available months for date picker
@@ -484,51 +502,186 @@ createApp({
             }));
         });
 
-        // ========== METHODS ==========
+        // Inverted index built once per data load: filter key -> Set of transaction ids.
+        // Filtering then becomes set algebra over postings instead of re-testing
+        // every transaction against every filter on each change.
+        const filterIndex = computed(() => {
+            const postings = {
+                merchant: new Map(),
+                category: new Map(),
+                location: new Map(),
+                month: new Map(),
+                tag: new Map()
+            };
+            const allTxnIds = new Set();
+            const seenMerchants = new Set();
 
-        function passesFilters(txn, merchant) {
-            const includes = activeFilters.value.filter(f => f.mode === 'include');
-            const excludes = activeFilters.value.filter(f => f.mode === 'exclude');
+            function post(type, key, id) {
+                let ids = postings[type].get(key);
+                if (!ids) {
+                    ids = new Set();
+                    postings[type].set(key, ids);
+                }
+                ids.add(id);
+            }
 
-            // Check excludes first
-            for (const f of excludes) {
-                if (matchesFilter(txn, merchant, f)) return false;
+            function indexMerchant(merchant) {
+                // The same merchant can appear in several sections and in the category view
+                if (seenMerchants.has(merchant)) return;
+                seenMerchants.add(merchant);
+
+                const merchantKeys = [merchant.id.toLowerCase(), merchant.displayName.toLowerCase()];
+                const categoryKeys = [
+                    merchant.category.toLowerCase(),
+                    merchant.subcategory.toLowerCase(),
+                    (merchant.categoryPath || '').toLowerCase()
+                ];
+                const tagKeys = (merchant.tags || []).map(t => t.toLowerCase());
+
+                for (const txn of merchant.transactions || []) {
+                    const id = txn.id;
+                    allTxnIds.add(id);
+                    merchantKeys.forEach(k => post('merchant', k, id));
+                    categoryKeys.forEach(k => post('category', k, id));
+                    tagKeys.forEach(k => post('tag', k, id));
+                    post('location', (txn.location || '').toLowerCase(), id);
+                    post('month', txn.month, id);
+                }
             }
 
-            // Group includes by type
-            const byType = {};
-            includes.forEach(f => {
-                if (!byType[f.type]) byType[f.type] = [];
-                byType[f.type].push(f);
-            });
+            const data = spendingData.value;
+            for (const section of Object.values(data.sections || {})) {
+                Object.values(section.merchants || {}).forEach(indexMerchant);
+            }
+            for (const category of Object.values(data.categoryView || {})) {
+                for (const subcat of Object.values(category.subcategories || {})) {
+                    Object.values(subcat.merchants || {}).forEach(indexMerchant);
+                }
+            }
+
+            return { postings, allTxnIds };
+        });
 
-            // AND across types, OR within type
-            for (const [type, filters] of Object.entries(byType)) {
-                const anyMatch = filters.some(f => matchesFilter(txn, merchant, f));
-                if (!anyMatch) return false;
+        // Unfiltered total and month count per merchant object, computed once per data load
+        const merchantBaseline = computed(() => {
+            const baseline = new Map();
+            const add = merchant => {
+                if (baseline.has(merchant)) return;
+                const txns = merchant.transactions || [];
+                baseline.set(merchant, {
+                    total: txns.reduce((sum, t) => sum + t.amount, 0),
+                    months: new Set(txns.map(t => t.month)).size
+                });
+            };
+            const data = spendingData.value;
+            for (const section of Object.values(data.sections || {})) {
+                Object.values(section.merchants || {}).forEach(add);
             }
+            for (const category of Object.values(data.categoryView || {})) {
+                for (const subcat of Object.values(category.subcategories || {})) {
+                    Object.values(subcat.merchants || {}).forEach(add);
+                }
+            }
+            return baseline;
+        });
 
-            return true;
+        // Ids of transactions passing the active filters (null = no filters, all visible)
+        const visibleTxnIds = computed(() => cachedForFilters('visibleTxnIds', () => {
+            const filters = activeFilters.value;
+            if (filters.length === 0) return null;
+
+            // Group includes by type: OR within a type, AND across types
+            const includesByType = {};
+            const excluded = new Set();
+            for (const f of filters) {
+                const ids = matchingTxnIds(f);
+                if (f.mode === 'exclude') {
+                    ids.forEach(id => excluded.add(id));
+                } else {
+                    if (!includesByType[f.type]) includesByType[f.type] = new Set();
+                    const union = includesByType[f.type];
+                    ids.forEach(id => union.add(id));
+                }
+            }
+
+            // Intersect smallest set first so the working set only shrinks
+            const includeSets = Object.values(includesByType).sort((a, b) => a.size - b.size);
+            let visible;
+            if (includeSets.length === 0) {
+                visible = new Set(filterIndex.value.allTxnIds);
+            } else {
+                visible = new Set(includeSets[0]);
+                for (const ids of includeSets.slice(1)) {
+                    for (const id of visible) {
+                        if (!ids.has(id)) visible.delete(id);
+                    }
+                }
+            }
+            excluded.forEach(id => visible.delete(id));
+            return visible;
+        }));
+
+        // ========== METHODS ==========
+
+        function passesFilters(txn, merchant) {
+            const visible = visibleTxnIds.value;
+            return visible === null || visible.has(txn.id);
         }
 
-        function matchesFilter(txn, merchant, filter) {
-            const text = filter.text.toLowerCase();
+        // Merchant with its transactions narrowed to the active filters, or null if none pass
+        function filterMerchant(merchant) {
+            const txns = merchant.transactions || [];
+            let filteredTxns, filteredTotal, filteredMonths;
+            if (visibleTxnIds.value === null) {
+                // Unfiltered: reuse the totals computed once at load
+                const base = merchantBaseline.value.get(merchant);
+                filteredTxns = txns;
+                filteredTotal = base.total;
+                filteredMonths = base.months;
+            } else {
+                filteredTxns = txns.filter(txn => passesFilters(txn, merchant));
+                filteredTotal = filteredTxns.reduce((sum, t) => sum + t.amount, 0);
+                filteredMonths = new Set(filteredTxns.map(t => t.month)).size;
+            }
+            if (filteredTxns.length === 0) return null;
+            return {
+                ...merchant,
+                filteredTxns,
+                filteredTotal,
+                filteredCount: filteredTxns.length,
+                filteredMonths
+            };
+        }
+
+        // Matches per individual filter (mode-independent), so adding or toggling
+        // one filter doesn't re-resolve the others against the index
+        const filterMatchCache = new Map();
+
+        // All transaction ids matching a single filter, looked up from the index
+        function matchingTxnIds(filter) {
+            return memoize(filterMatchCache, filterKey(filter.type, filter.lc), () => resolveFilter(filter));
+        }
+
+        function resolveFilter(filter) {
+            const postings = filterIndex.value.postings[filter.type];
+            if (!postings) return new Set();
+
+            const text = filter.lc;
+            const result = new Set();
             switch (filter.type) {
-                case 'merchant':
-                    return merchant.id.toLowerCase() === text ||
-                           merchant.displayName.toLowerCase() === text;
                 case 'category':
-                    return merchant.category.toLowerCase().includes(text) ||
-                           merchant.subcategory.toLowerCase().includes(text) ||
-                           (merchant.categoryPath || '').toLowerCase().includes(text);
-                case 'location':
-                    return (txn.location || '').toLowerCase() === text;
+                    // Substring match: scan the (small) set of distinct category keys
+                    for (const [key, ids] of postings) {
+                        if (key.includes(text)) ids.forEach(id => result.add(id));
+                    }
+                    return result;
                 case 'month':
-                    return monthMatches(txn.month, filter.text);
-                case 'tag':
-                    return (merchant.tags || []).some(t => t.toLowerCase() === text);
+                    for (const [month, ids] of postings) {
+                        if (monthMatches(month, filter.text)) ids.forEach(id => result.add(id));
+                    }
+                    return result;
                 default:
-                    return false;
+                    return postings.get(text) || result;
             }
         }
 
@@ -540,10 +693,20 @@ createApp({
             return txnMonth === filterText;
         }
 
+        // Active filters keyed by type and text, for O(1) duplicate checks
+        function filterKey(type, text) {
+            return `${type}:${text}`;
+        }
+
+        const activeFilterKeys = computed(() =>
+            new Set(activeFilters.value.map(f => filterKey(f.type, f.text)))
+        );
+
         function addFilter(text, type, displayText = null) {
-            if (activeFilters.value.some(f => f.text === text && f.type === type)) return;
-            activeFilters.value.push({ text, type, mode: 'include', displayText: displayText || text });
+            if (activeFilterKeys.value.has(filterKey(type, text))) return;
+            activeFilters.value.push({ text, lc: text.toLowerCase(), type, mode: 'include', displayText: displayText || text });
             searchQuery.value = '';
+            autocompleteQuery.value = '';
             showAutocomplete.value = false;
             autocompleteIndex.value = -1;
         }
@@ -591,28 +754,24 @@ createApp({
         // Formatting helpers
         function formatCurrency(amount) {
             if (amount === undefined || amount === null) return '$0';
-            const rounded = Math.round(amount);
-            return '$' + rounded.toLocaleString('en-US');
+            return '$' + AMOUNT_FORMAT.format(Math.round(amount));
         }
 
         function formatDate(dateStr) {
             if (!dateStr) return '';
             // Handle MM/DD format from Python
-            if (dateStr.match(/^\d{1,2}\/\d{1,2}$/)) {
+            if (SHORT_DATE_RE.test(dateStr)) {
                 const [month, day] = dateStr.split('/');
-                const months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
-                return `${months[parseInt(month)-1]} ${parseInt(day)}`;
+                return `${MONTH_NAMES[parseInt(month)-1]} ${parseInt(day)}`;
             }
             // Handle YYYY-MM-DD format
-            const d = new Date(dateStr + 'T12:00:00');
-            return d.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+            return DATE_FORMAT.format(new Date(dateStr + 'T12:00:00'));
         }
 
         function formatMonthLabel(key) {
             if (!key) return '';
             const [year, month] = key.split('-');
-            const months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
-            return `${months[parseInt(month)-1]} ${year}`;
+            return `${MONTH_NAMES[parseInt(month)-1]} ${year}`;
         }
 
         function formatPct(value, total) {
@@ -647,12 +806,30 @@ createApp({
 
         // ========== SEARCH/AUTOCOMPLETE ==========
 
+        let pendingSearchFrame = 0;
+
         function onSearchInput() {
             showAutocomplete.value = true;
             autocompleteIndex.value = -1;
+            // Coalesce keystrokes: filter and re-render the list once per animation frame
+            if (!pendingSearchFrame) {
+                pendingSearchFrame = requestAnimationFrame(() => {
+                    pendingSearchFrame = 0;
+                    autocompleteQuery.value = searchQuery.value;
+                });
+            }
         }
 
         function onSearchKeydown(e) {
+            // Typed characters are handled by onSearchInput
+            if (!['ArrowDown', 'ArrowUp', 'Enter', 'Escape'].includes(e.key)) return;
+            // Navigation must act on the list for what has been typed so far,
+            // so apply any keystrokes still waiting for the next frame now
+            if (pendingSearchFrame) {
+                cancelAnimationFrame(pendingSearchFrame);
+                pendingSearchFrame = 0;
+            }
+            autocompleteQuery.value = searchQuery.value;
             const items = filteredAutocomplete.value;
             if (!items.length) return;
 
@@ -710,14 +887,17 @@ createApp({
             const hash = location.hash.slice(1);
             if (!hash) return;
             const typeMap = { c: 'category', m: 'merchant', l: 'location', d: 'month', t: 'tag' };
+            const seen = new Set(activeFilterKeys.value);
             hash.split('&').forEach(part => {
                 const mode = part[0] === '-' ? 'exclude' : 'include';
                 const start = part[0] === '+' || part[0] === '-' ? 1 : 0;
                 const type = typeMap[part[start]] || 'category';
                 const text = decodeURIComponent(part.slice(part.indexOf(':') + 1));
-                if (text && !activeFilters.value.some(f => f.text === text && f.type === type)) {
+                const key = filterKey(type, text);
+                if (text && !seen.has(key)) {
+                    seen.add(key);
                     const displayText = getDisplayText(type, text);
-                    activeFilters.value.push({ text, type, mode, displayText });
+                    activeFilters.value.push({ text, lc: text.toLowerCase(), type, mode, displayText });
                 }
             });
         }
@@ -955,6 +1135,18 @@ createApp({
                 activeFilters.value = [];
                 hashToFilters();
             });
+
+            // Build the search indexes while the page is idle, so the first
+            // filter or keystroke doesn't pay for them
+            const warmIndexes = () => {
+                filterIndex.value;
+                autocompleteGrams.value;
+            };
+            if (window.requestIdleCallback) {
+                window.requestIdleCallback(warmIndexes, { timeout: 2000 });
+            } else {
+                setTimeout(warmIndexes, 0);
+            }
         });
 
         // ========== RETURN ==========
@@ -4,7 +4,9 @@ import pytest
 import tempfile
 import os
 
-from tally.analyzer import parse_amount, parse_generic_csv
+from datetime import datetime
+
+from tally.analyzer import parse_amount, parse_generic_csv, _date_parser
 from tally.format_parser import parse_format_string
 from tally.merchant_utils import get_all_rules
 
@@ -468,6 +470,134 @@ class TestDateFormatWithSpaces:
             os.unlink(f.name)
 
 
+class TestParseAmex:
+    """Tests for the (deprecated) AMEX CSV parser."""
+
+    def _parse(self, content):
+        from tally.analyzer import parse_amex
+
+        f = tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False)
+        try:
+            f.write(content.encode('utf-8'))
+            f.close()
+            return parse_amex(f.name, get_all_rules(), {'WA'})
+        finally:
+            os.unlink(f.name)
+
+    def test_columns_found_by_header_name(self):
+        """Columns are looked up by header, whatever their order."""
+        txns = self._parse(
+            "Reference,Amount,Description,Date\n"
+            "r1,15.99,NETFLIX.COM LOS GATOS CA,01/15/2025\n"
+            "r2,42.00,GROCERY OUTLET SEATTLE WA,01/16/2025\n"
+        )
+        assert [(t['date'], t['description'], t['amount']) for t in txns] == [
+            (datetime(2025, 1, 15), 'NETFLIX.COM LOS GATOS CA', 15.99),
+            (datetime(2025, 1, 16), 'GROCERY OUTLET SEATTLE WA', 42.0),
+        ]
+        assert txns[0]['source'] == 'AMEX'
+        assert [t['location'] for t in txns] == ['CA', 'WA']
+
+    def test_missing_required_column(self):
+        """A file without a required column yields no transactions."""
+        assert self._parse("Date,Description\n01/15/2025,NETFLIX\n") == []
+
+    def test_empty_file(self):
+        """An empty file yields no transactions."""
+        assert self._parse("") == []
+
+    def test_short_and_bad_rows_skipped(self):
+        """Rows missing fields, with bad values or zero amounts are skipped."""
+        txns = self._parse(
+            "Date,Description,Amount\n"
+            "01/15/2025,NETFLIX\n"
+            "01/16/2025,SPOTIFY,abc\n"
+            "13/45/2025,HULU,7.99\n"
+            "01/17/2025,FREE TRIAL,0.00\n"
+            "01/18/2025,COFFEE SHOP,4.50\n"
+        )
+        assert [t['description'] for t in txns] == ['COFFEE SHOP']
+
+    def test_crlf_line_endings(self):
+        """CRLF files parse the same as LF files, with no stray carriage returns."""
+        content = "Date,Description,Amount\n01/15/2025,NETFLIX.COM,15.99\n01/16/2025,COFFEE SHOP,4.50\n"
+        crlf = self._parse(content.replace('\n', '\r\n'))
+        assert crlf == self._parse(content)
+        assert [t['description'] for t in crlf] == ['NETFLIX.COM', 'COFFEE SHOP']
+
+
+class TestParseBoa:
+    """Tests for the (deprecated) BOA statement parser."""
+
+    def _parse(self, content):
+        from tally.analyzer import parse_boa
+
+        f = tempfile.NamedTemporaryFile(mode='wb', suffix='.txt', delete=False)
+        try:
+            f.write(content.encode('utf-8'))
+            f.close()
+            return parse_boa(f.name, get_all_rules(), {'WA'})
+        finally:
+            os.unlink(f.name)
+
+    def test_statement_lines(self):
+        """Date, description and amount are read from each statement line."""
+        txns = self._parse(
+            "Beginning balance as of 01/01/2025                 1,000.00\n"
+            "01/15/2025  NETFLIX.COM LOS GATOS CA  -15.99  984.01\n"
+            "  01/16/2025   PAYROLL DEPOSIT   1,250.00   2,234.01  \n"
+        )
+        assert [(t['date'], t['description'], t['amount']) for t in txns] == [
+            (datetime(2025, 1, 15), 'NETFLIX.COM LOS GATOS CA', -15.99),
+            (datetime(2025, 1, 16), 'PAYROLL DEPOSIT', 1250.0),
+        ]
+        assert txns[0]['source'] == 'BOA'
+        assert txns[0]['location'] == 'CA'
+
+    def test_short_and_zero_lines_skipped(self):
+        """Lines without both amount and balance, or with a zero amount, are skipped."""
+        txns = self._parse(
+            "01/15/2025  NETFLIX.COM  -15.99\n"
+            "01/16/2025  FEE WAIVED  0.00  984.01\n"
+            "13/45/2025  BAD DATE  -1.00  983.01\n"
+            "01/17/2025  COFFEE SHOP  -4.50  979.51\n"
+        )
+        assert [t['description'] for t in txns] == ['COFFEE SHOP']
+
+    def test_crlf_line_endings(self):
+        """CRLF statements parse the same as LF statements."""
+        content = "01/15/2025  NETFLIX.COM  -15.99  984.01\n01/17/2025  COFFEE SHOP  -4.50  979.51\n"
+        crlf = self._parse(content.replace('\n', '\r\n'))
+        assert crlf == self._parse(content)
+        assert [t['amount'] for t in crlf] == [-15.99, -4.5]
+
+
+class TestDateParsers:
+    """Tests for the fast fixed-format date parsers."""
+
+    @pytest.mark.parametrize('date_format,date_str', [
+        ('%m/%d/%Y', '01/15/2025'),
+        ('%m/%d/%Y', '1/5/2025'),
+        ('%Y-%m-%d', '2025-01-15'),
+        ('%Y-%m-%d', '2025-1-5'),
+        ('%d/%m/%Y', '15/01/2025'),
+    ])
+    def test_matches_strptime(self, date_format, date_str):
+        """Fast parsers agree with strptime, including non-padded dates."""
+        assert _date_parser(date_format)(date_str) == datetime.strptime(date_str, date_format)
+
+    @pytest.mark.parametrize('date_format,date_str', [
+        ('%m/%d/%Y', '13/01/2025'),
+        ('%m/%d/%Y', '02/30/2025'),
+        ('%m/%d/%Y', '2025-01-15'),
+        ('%Y-%m-%d', '2025-02-30'),
+    ])
+    def test_invalid_dates_raise(self, date_format, date_str):
+        """Invalid dates raise ValueError like strptime."""
+        with pytest.raises(ValueError):
+            _date_parser(date_format)(date_str)
+
+
 class TestCustomCaptures:
     """Tests for custom column captures with description templates."""
 
@@ -898,3 +1028,41 @@ class TestAccountType:
 
         assert spec.negate_amount == True   # From account_type
         assert spec.skip_negative == False  # Overridden
+
+
+class TestExportJson:
+    """Tests for export_json output modes."""
+
+    def _stats(self):
+        from tally.analyzer import analyze_transactions
+
+        txns = [
+            {'date': datetime(2025, month, 5), 'description': 'NETFLIX', 'raw_description': 'NETFLIX',
+             'merchant': 'Netflix', 'amount': 15.99, 'category': 'Subscriptions',
+             'subcategory': 'Streaming', 'source': 'Card'}
+            for month in range(1, 4)
+        ]
+        return analyze_transactions(txns)
+
+    def test_compact_matches_indented(self):
+        """Compact output has no line breaks but the same content."""
+        import json
+        from tally.analyzer import export_json
+
+        stats = self._stats()
+        indented = export_json(stats, verbose=2)
+        compact = export_json(stats, verbose=2, compact=True)
+
+        assert '\n' in indented
+        assert '\n' not in compact
+        assert json.loads(compact) == json.loads(indented)
+
+    def test_writes_to_file(self):
+        """With fp, the JSON is written to the file and nothing is returned."""
+        import io
+        from tally.analyzer import export_json
+
+        stats = self._stats()
+        buf = io.StringIO()
+        assert export_json(stats, fp=buf) is None
+        assert buf.getvalue() == export_json(stats)
@@ -0,0 +1,77 @@
+"""Tests for classification rule matching."""
+
+import itertools
+
+from tally.classification_rules import (
+    ClassificationRule, FieldMatch, NumericCondition,
+    classify_merchant, get_default_rules_parsed, parse_rules, rules_for_fields,
+)
+
+
+def make_stats(category, subcategory, months_active, total, cv):
+    """Merchant stats as analyze_transactions passes them to classify_merchant."""
+    count = months_active * 2
+    return {
+        'category': category,
+        'subcategory': subcategory,
+        'months_active': months_active,
+        'count': count,
+        'total': total,
+        'cv': cv,
+        'max_payment': total / count * 4,
+    }
+
+
+class TestRulesForFields:
+    """rules_for_fields must never change which rule classifies a merchant."""
+
+    def _rules(self):
+        rules = get_default_rules_parsed() + parse_rules("""
+subcategory=Grocery[months>=3] -> monthly,avg
+category=Food,subcategory=Delivery[total>500] -> periodic,/12
+category=Other -> excluded,/12
+""")
+        # Rules built in code can reference other fields or combine fields with
+        # the default flag; matches_rule ignores both, so the subset must too
+        rules.insert(0, ClassificationRule(
+            line_number=0, raw_text='merchant=Netflix -> annual,/12',
+            field_matches=[FieldMatch(field='merchant', value='Netflix')],
+            conditions=[NumericCondition(variable='months', operator='<=', value=1)],
+            bucket='annual', calc_type='/12'))
+        rules.insert(1, ClassificationRule(
+            line_number=0, raw_text='category=Travel * -> one_off,/12',
+            field_matches=[FieldMatch(field='category', value='Travel')],
+            conditions=[NumericCondition(variable='total', operator='>', value=9000)],
+            bucket='one_off', calc_type='/12', is_default=True))
+        return rules
+
+    def test_subset_classifies_like_full_rules(self):
+        """Every merchant gets the same bucket and calc type from its subset."""
+        rules = self._rules()
+        fields = [
+            ('Bills', 'Insurance'), ('Bills', 'Tax'), ('Bills', 'Phone'),
+            ('Food', 'Grocery'), ('Food', 'Delivery'), ('Food', 'Restaurant'),
+            ('Health', 'Medical'), ('Home', 'Improvement'), ('Shopping', 'Electronics'),
+            ('Travel', 'Hotel'), ('Transfers', 'Card Payment'), ('Other', 'Uncategorized'),
+            ('Subscriptions', 'Streaming'), ('Unknown', 'Unknown'), ('', ''),
+        ]
+        for (category, subcategory), months, total, cv in itertools.product(
+                fields, (1, 2, 3, 6, 9, 12), (50.0, 1500.0, 9500.0), (0.1, 0.5, 1.2)):
+            stats = make_stats(category, subcategory, months, total, cv)
+            subset = rules_for_fields(rules, category, subcategory)
+            assert classify_merchant(stats, subset) == classify_merchant(stats, rules), stats
+
+    def test_keeps_rule_order(self):
+        """The subset is the matching rules in their original order."""
+        rules = parse_rules("""
+category=Food -> variable,avg
+subcategory=Grocery -> monthly,avg
+category=Bills -> monthly,avg
+* -> variable,/12
+""")
+        subset = rules_for_fields(rules, 'Food', 'Grocery')
+        assert [rule.raw_text for rule in subset] == [
+            'category=Food -> variable,avg',
+            'subcategory=Grocery -> monthly,avg',
+            '* -> variable,/12',
+        ]
@@ -349,3 +349,89 @@ data_sources:
             assert os.path.exists(os.path.join(config_dir, 'merchants.rules'))
 
 
+
+
+class TestParseSources:
+    """Tests for parsing data sources, in worker processes for large inputs."""
+
+    def _job(self, filepath, name):
+        from tally.format_parser import parse_format_string
+
+        spec = parse_format_string('{date:%m/%d/%Y},{description},{amount}')
+        return ('generic', str(filepath), [], set(), None, spec, name, '.')
+
+    def test_parallel_results_in_order_with_errors_per_job(self, tmp_path, monkeypatch):
+        """Each job gets its own result, in job order; a failing file doesn't stop the others."""
+        from tally import cli
+
+        first = tmp_path / 'first.csv'
+        first.write_text('Date,Description,Amount\n01/05/2025,NETFLIX,15.99\n')
+        broken = tmp_path / 'broken.csv'
+        broken.write_bytes(b'Date,Description,Amount\n01/06/2025,\xff\xfe,1.00\n')
+        second = tmp_path / 'second.csv'
+        second.write_text('Date,Description,Amount\n01/07/2025,SPOTIFY,9.99\n'
+                          '01/08/2025,SPOTIFY,9.99\n')
+
+        monkeypatch.setattr(cli, 'PARALLEL_PARSE_MIN_BYTES', 0)
+        results = cli._parse_sources([
+            self._job(first, 'First'), self._job(broken, 'Broken'), self._job(second, 'Second'),
+        ])
+
+        assert len(results) == 3
+        assert [t['source'] for t in results[0]] == ['First']
+        assert isinstance(results[1], UnicodeDecodeError)
+        assert [t['source'] for t in results[2]] == ['Second', 'Second']
+
+    def test_serial_path_matches_parallel(self, tmp_path, monkeypatch):
+        """Small inputs are parsed in-process with the same results."""
+        from tally import cli
+
+        source = tmp_path / 'data.csv'
+        source.write_text('Date,Description,Amount\n01/05/2025,NETFLIX,15.99\n')
+        jobs = [self._job(source, 'A'), self._job(source, 'B')]
+
+        serial = cli._parse_sources(jobs)
+        monkeypatch.setattr(cli, 'PARALLEL_PARSE_MIN_BYTES', 0)
+        assert cli._parse_sources(jobs) == serial
+
+    def test_parallel_applies_rules_with_modifiers(self, tmp_path, monkeypatch):
+        """Rules carrying parsed amount/date modifiers reach the workers intact."""
+        from tally import cli
+        from tally.format_parser import parse_format_string
+        from tally.merchant_utils import get_all_rules
+
+        merchants = tmp_path / 'merchants.csv'
+        merchants.write_text(
+            'Pattern,Merchant,Category,Subcategory,Tags\n'
+            'COSTCO[amount>100],Costco Bulk,Shopping,Bulk,business\n'
+            'COSTCO,Costco,Food,Grocery,\n'
+            'BESTBUY[date=2025-01-15],Best Buy Sale,Shopping,Electronics,\n'
+            'NETFLIX,Netflix,Subscriptions,Streaming,\n'
+        )
+        rules = get_all_rules(str(merchants))
+        spec = parse_format_string('{date:%m/%d/%Y},{description},{amount}')
+
+        rows = [
+            '01/05/2025,COSTCO WHOLESALE #123,150.00',
+            '01/06/2025,COSTCO WHOLESALE #123,42.50',
+            '01/15/2025,BESTBUY 456,499.99',
+            '01/16/2025,BESTBUY 456,19.99',
+            '01/20/2025,NETFLIX.COM,15.99',
+        ]
+        jobs = []
+        for name in ('Card', 'Checking'):
+            source = tmp_path / f'{name}.csv'
+            source.write_text('Date,Description,Amount\n' + '\n'.join(rows * 20) + '\n')
+            jobs.append(('generic', str(source), rules, set(), None, spec, name, '.'))
+
+        monkeypatch.setattr(cli, 'PARALLEL_PARSE_MIN_BYTES', 4096)
+        assert sum(os.path.getsize(job[1]) for job in jobs) > cli.PARALLEL_PARSE_MIN_BYTES
+        parallel = cli._parse_sources(jobs)
+        monkeypatch.setattr(cli, 'PARALLEL_PARSE_MIN_BYTES', float('inf'))
+        serial = cli._parse_sources(jobs)
+
+        assert parallel == serial
+        assert [t['merchant'] for t in parallel[0][:5]] == [
+            'Costco Bulk', 'Costco', 'Best Buy Sale', 'Bestbuy', 'Netflix',
+        ]
+        assert parallel[0][0]['tags'] == ['business']
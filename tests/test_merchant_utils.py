@@ -9,6 +9,9 @@ from tally.merchant_utils import (
     load_merchant_rules,
     get_all_rules,
     normalize_merchant,
+    normalize_merchants,
+    compile_rules,
+    combine_rules,
     clean_description,
     extract_merchant_name,
     _expr_to_regex,
@@ -319,6 +322,107 @@ class TestNormalizeMerchant:
         assert result[:3] == ('Amazon', 'Shopping', 'Online')
 
 
+class TestNormalizeMerchants:
+    """Tests for batch normalize_merchants."""
+
+    def test_matches_per_description_results(self):
+        """Batch results equal calling normalize_merchant for each description."""
+        rules = [
+            ('UBER\\s(?!EATS)', 'Uber', 'Transport', 'Rideshare',
+             ParsedPattern(regex_pattern='UBER\\s(?!EATS)')),
+            ('UBER\\s*EATS', 'Uber Eats', 'Food', 'Delivery',
+             ParsedPattern(regex_pattern='UBER\\s*EATS')),
+            ('[invalid', 'Broken', 'X', 'Y', ParsedPattern(regex_pattern='[invalid')),
+        ]
+        descriptions = ['UBER RIDE 12345', 'UBER EATS ORDER', 'RANDOM SHOP #42']
+        results = normalize_merchants(descriptions, rules, cleaning_patterns=[r'#\d+'])
+        assert results == [normalize_merchant(d, rules, cleaning_patterns=[r'#\d+']) for d in descriptions]
+        assert results[2][:3] == ('Random Shop', 'Unknown', 'Unknown')
+
+    def test_prepared_rules_reused_until_list_changes(self, monkeypatch):
+        """Repeated calls with the same rules reuse them; an in-place change is picked up."""
+        from tally import merchant_utils
+
+        calls = []
+        compile_rules_orig = merchant_utils.compile_rules
+        monkeypatch.setattr(merchant_utils, 'compile_rules',
+                            lambda rules: calls.append(rules) or compile_rules_orig(rules))
+
+        rules = [('NETFLIX', 'Netflix', 'Subscriptions', 'Streaming')]
+        normalize_merchant('NETFLIX.COM', rules)
+        normalize_merchant('NETFLIX 123', rules)
+        assert len(calls) == 1
+
+        rules.insert(0, ('NETFLIX', 'Netflix Family', 'Subscriptions', 'Streaming'))
+        assert normalize_merchant('NETFLIX.COM', rules)[0] == 'Netflix Family'
+        assert len(calls) == 2
+
+    def test_modifiers_use_parallel_amounts(self):
+        """Each description is checked against its own amount."""
+        from tally.modifier_parser import parse_pattern_with_modifiers
+
+        rules = [
+            ('COSTCO', 'Costco Bulk', 'Shopping', 'Bulk',
+             parse_pattern_with_modifiers('COSTCO[amount>200]')),
+            ('COSTCO', 'Costco', 'Food', 'Grocery',
+             ParsedPattern(regex_pattern='COSTCO')),
+        ]
+        results = normalize_merchants(['COSTCO', 'COSTCO'], rules, amounts=[250, 50])
+        assert [r[0] for r in results] == ['Costco Bulk', 'Costco']
+
+    def test_match_info_not_shared(self):
+        """Each match gets its own match_info dict."""
+        rules = [('COSTCO', 'Costco', 'Food', 'Grocery', ParsedPattern(regex_pattern='COSTCO'), 'user', ['bulk'])]
+        first, second = normalize_merchants(['COSTCO', 'COSTCO'], rules)
+        assert first[3] == {'pattern': 'COSTCO', 'source': 'user', 'tags': ['bulk']}
+        assert first[3] is not second[3]
+
+
+class TestCombineRules:
+    """Tests for the single-regex first-matching-rule lookup."""
+
+    def _first(self, combined, text):
+        match = combined.match(text)
+        return match.lastgroup if match else None
+
+    def test_reports_first_rule_in_order_not_leftmost_match(self):
+        """The earliest rule wins even when a later rule matches further left."""
+        combined = combine_rules(compile_rules([
+            ('RIDE', 'Uber', 'Transport', 'Rideshare'),
+            ('UBER', 'Uber', 'Transport', 'Rideshare'),
+        ]))
+        assert self._first(combined, 'UBER RIDE') == '_rule0'
+        assert self._first(combined, 'UBER EATS') == '_rule1'
+        assert self._first(combined, 'NETFLIX') is None
+
+    def test_backreferences_not_combined(self):
+        """Patterns whose group numbers would shift are left to the linear scan."""
+        assert combine_rules(compile_rules([('(A)\\1', 'X', 'C', 'S')])) is None
+
+    def test_inline_global_flags_not_combined(self):
+        """A rule with a global flag like (?x) must not change how earlier rules match."""
+        rules = [
+            ('UBER EATS', 'Uber Eats', 'Food', 'Delivery'),
+            ('(?x) NET FLIX', 'Netflix', 'Subscriptions', 'Streaming'),
+        ]
+        assert combine_rules(compile_rules(rules)) is None
+        assert normalize_merchant('UBER EATS 123', rules)[:3] == ('Uber Eats', 'Food', 'Delivery')
+        assert normalize_merchant('NETFLIX.COM', rules)[:3] == ('Netflix', 'Subscriptions', 'Streaming')
+
+    def test_modifier_failure_falls_through_to_later_rules(self):
+        """A combined hit whose modifiers fail continues with the following rules."""
+        from tally.modifier_parser import parse_pattern_with_modifiers
+
+        rules = [
+            ('COSTCO', 'Costco Bulk', 'Shopping', 'Bulk',
+             parse_pattern_with_modifiers('COSTCO[amount>200]')),
+            ('WHOLESALE', 'Wholesale', 'Shopping', 'Wholesale',
+             ParsedPattern(regex_pattern='WHOLESALE')),
+        ]
+        results = normalize_merchants(['COSTCO WHOLESALE'], rules, amounts=[50])
+        assert results[0][0] == 'Wholesale'
+
+
 class TestCleanDescription:
     """Tests for clean_description function."""
 